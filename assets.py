@@ -0,0 +1,356 @@
+"""
+Asset stage for images in asset/image.
+
+rename.py feeds every document body through AssetStage.rewrite() in the same
+pass that renames the docs. Meanwhile the assets are hashed on a thread pool,
+so a large asset folder is hashed while the docs are being processed.
+AssetStage.finish() then:
+
+- renames every asset to a content-addressed name (<sha256 prefix><ext>);
+  identical images collapse into one file. An asset whose old name still
+  appears in an output (a reference the rewrite did not recognise) is
+  copied instead, so both names keep working,
+- reports orphaned assets (not referenced by any doc) and missing images
+  (referenced but not present).
+
+References are recognised in Markdown (![alt](path)), HTML (<img src="path">)
+and Obsidian (![[name.png]]) form. They are matched to assets by file name,
+since the docs are flattened and always point into asset/image.
+
+Run directly for a read-only report on the current docs:
+    python assets.py
+"""
+
+import hashlib
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, unquote
+
+from streaming import iter_chunks
+
+# --- Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIR_NAME = os.path.join("asset", "image")
+DOCS_DIR_NAME = "docs"
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".bmp"}
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_PREFIX_LENGTH = 16  # Hex digits of sha256 used in content-addressed names
+REFERENCE_OVERLAP = 64 * 1024  # Longer than any image reference / <img> tag
+# --- Configuration End ---
+
+# ![alt](path "title") / ![alt](<path with spaces>)
+MARKDOWN_IMAGE_RE = re.compile(r"(!\[[^\]\n]*\]\(\s*)(<[^>\n]+>|[^)\s]+)")
+# <img ... src="path" ...>
+HTML_IMAGE_RE = re.compile(r"(<img\b[^>]*?\bsrc\s*=\s*)([\"'])([^\"'\n]+)\2", re.IGNORECASE)
+# ![[Pasted image 20250324154624.png|300]]
+OBSIDIAN_IMAGE_RE = re.compile(r"(!\[\[)([^\]|\n]+)")
+# Cheap pre-check on raw bytes: documents without a match have no references
+IMAGE_HINT_RE = re.compile(rb"!\[|<img", re.IGNORECASE)
+
+
+def _is_local(path):
+    return not re.match(r"^(?:[a-z][a-z0-9+.-]*:|//|#)", path, re.IGNORECASE)
+
+
+def _split_path(path):
+    """Splits a reference into (directory part incl. '/', decoded file name)."""
+    path = path.split("#", 1)[0].split("?", 1)[0]
+    directory, _, name = path.rpartition("/")
+    return (directory + "/" if directory or path.startswith("/") else ""), unquote(name)
+
+
+def hash_file(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_addressed_name(filename, digest):
+    extension = os.path.splitext(filename)[1].lower()
+    return f"{digest[:HASH_PREFIX_LENGTH]}{extension}"
+
+
+def find_image_references(markdown_content):
+    """Returns the decoded file names of all local images referenced."""
+    names = []
+    for match in MARKDOWN_IMAGE_RE.finditer(markdown_content):
+        path = match.group(2).strip("<>")
+        if _is_local(path):
+            names.append(_split_path(path)[1])
+    for match in HTML_IMAGE_RE.finditer(markdown_content):
+        if _is_local(match.group(3)):
+            names.append(_split_path(match.group(3))[1])
+    for match in OBSIDIAN_IMAGE_RE.finditer(markdown_content):
+        name = _split_path(match.group(2).strip())[1]
+        # ![[Note]] embeds other notes; only image embeds are assets
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+            names.append(name)
+    return [name for name in names if name]
+
+
+class AssetStage:
+    """
+    Collects image references while documents are processed and renames the
+    assets to content-addressed names once all documents have been seen.
+    """
+
+    def __init__(self, asset_dir, rename_assets=True, max_workers=None, hashes=None):
+        """
+        hashes: asset file name -> digest computed elsewhere (e.g. by the
+        shard coordinator in shard.py); the assets are not hashed again.
+        """
+        self.asset_dir = asset_dir
+        self.rename_assets = rename_assets
+        self.max_workers = max_workers
+        self._executor = None
+        self._futures = {}
+        self._hashes = hashes
+        self._renames = None
+        self.references = {}  # asset file name -> set of doc names
+        self.unrewritten = {}  # asset file name -> docs still using the old name
+        self._asset_names = None
+        self._old_name_re = None
+        self._old_name_variants = {}
+
+    # --- Hashing ---
+
+    def asset_names(self):
+        """Asset file names, known without waiting for the hashes."""
+        if self._asset_names is None:
+            if self._hashes is not None:
+                self._asset_names = sorted(self._hashes)
+            elif not os.path.isdir(self.asset_dir):
+                self._asset_names = []
+            else:
+                self._asset_names = [
+                    filename
+                    for filename in sorted(os.listdir(self.asset_dir))
+                    if os.path.isfile(os.path.join(self.asset_dir, filename))
+                    and os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS
+                ]
+        return self._asset_names
+
+    def start(self):
+        """Starts hashing every asset in the background."""
+        if self._hashes is not None:
+            return
+        if not self.asset_names():
+            self._hashes = {}
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        for filename in self.asset_names():
+            filepath = os.path.join(self.asset_dir, filename)
+            self._futures[filename] = self._executor.submit(hash_file, filepath)
+
+    def hashes(self):
+        """Asset file name -> sha256 hex digest (waits for hashing to finish)."""
+        if self._hashes is None:
+            if self._executor is None:
+                self.start()
+            if self._hashes is None:
+                self._hashes = {
+                    filename: future.result()
+                    for filename, future in self._futures.items()
+                }
+                self._executor.shutdown()
+        return self._hashes
+
+    def renames(self):
+        """Asset file name -> content-addressed file name."""
+        if self._renames is None:
+            self._renames = {
+                filename: content_addressed_name(filename, digest)
+                for filename, digest in self.hashes().items()
+            }
+        return self._renames
+
+    # --- Per-document pass ---
+
+    def add_references(self, doc_name, names):
+        for name in names:
+            self.references.setdefault(name, set()).add(doc_name)
+
+    def add_unrewritten(self, doc_name, names):
+        for name in names:
+            self.unrewritten.setdefault(name, set()).add(doc_name)
+
+    def _old_name_pattern(self):
+        """Bytes regex matching any asset name, plain or URL-quoted; None if no assets."""
+        if self._old_name_re is None and self.asset_names():
+            for name in self.asset_names():
+                for variant in {name, quote(name)}:
+                    self._old_name_variants[variant.encode("utf-8")] = name
+            alternatives = sorted(self._old_name_variants, key=len, reverse=True)
+            self._old_name_re = re.compile(
+                rb"(?<![\w.%-])(?:"
+                + b"|".join(re.escape(variant) for variant in alternatives)
+                + rb")(?![\w.-])"
+            )
+        return self._old_name_re
+
+    def find_unrewritten(self, data, doc_name):
+        """
+        Records asset names still present in written output bytes (references
+        the rewrite did not recognise, or names mentioned elsewhere). Those
+        assets keep their old name as well.
+        """
+        if not self.rename_assets:
+            return
+        pattern = self._old_name_pattern()
+        if pattern is None:
+            return
+        names = {self._old_name_variants[match.group(0)] for match in pattern.finditer(data)}
+        self.add_unrewritten(doc_name, names)
+
+    def scan_unrewritten(self, f, start, end, doc_name):
+        """find_unrewritten for bytes [start, end) of a file copied unchanged."""
+        if self.rename_assets and self._old_name_pattern() is not None:
+            for chunk in iter_chunks(f, start, end):
+                self.find_unrewritten(chunk, doc_name)
+
+    def rewrite(self, markdown_content, doc_name):
+        """
+        Records the images referenced by a document and, when renaming is
+        enabled, returns the content with references to known assets rewritten
+        to their content-addressed names.
+        """
+        referenced = find_image_references(markdown_content)
+        self.add_references(doc_name, referenced)
+        if not referenced or not self.rename_assets:
+            return markdown_content
+
+        renames = self.renames()
+
+        def renamed(path, encode):
+            directory, name = _split_path(path)
+            if name not in renames or renames[name] == name:
+                return path
+            return directory + (quote(renames[name]) if encode else renames[name])
+
+        def markdown_sub(match):
+            path = match.group(2)
+            if path.startswith("<"):
+                return match.group(1) + "<" + renamed(path[1:-1], False) + ">"
+            return match.group(1) + renamed(path, True)
+
+        def html_sub(match):
+            quote_char = match.group(2)
+            return match.group(1) + quote_char + renamed(match.group(3), True) + quote_char
+
+        def obsidian_sub(match):
+            return match.group(1) + renamed(match.group(2).strip(), False)
+
+        markdown_content = MARKDOWN_IMAGE_RE.sub(markdown_sub, markdown_content)
+        markdown_content = HTML_IMAGE_RE.sub(html_sub, markdown_content)
+        return OBSIDIAN_IMAGE_RE.sub(obsidian_sub, markdown_content)
+
+    # --- Final step ---
+
+    def duplicates(self):
+        """Groups (lists) of asset names with identical content."""
+        groups = {}
+        for filename, digest in self.hashes().items():
+            groups.setdefault(digest, []).append(filename)
+        return [sorted(names) for names in groups.values() if len(names) > 1]
+
+    def orphans(self):
+        renames = self.renames()
+        return sorted(
+            name
+            for name in self.hashes()
+            if name not in self.references
+            and name not in self.unrewritten
+            and renames[name] not in self.references
+        )
+
+    def missing(self):
+        """Referenced image name -> sorted doc names referencing it."""
+        hashes = self.hashes()
+        known = set(hashes) | set(self.renames().values())
+        return {
+            name: sorted(docs)
+            for name, docs in sorted(self.references.items())
+            if name not in known
+        }
+
+    def apply_renames(self):
+        """
+        Renames assets on disk to their content-addressed names, removing
+        byte-identical copies. Assets whose old name is still used by an
+        output are copied and keep the old file too.
+        Returns (renamed_count, removed_count, kept_count).
+        """
+        renamed_count = 0
+        removed_count = 0
+        kept_count = 0
+        for filename, new_name in sorted(self.renames().items()):
+            if filename == new_name:
+                continue
+            source = os.path.join(self.asset_dir, filename)
+            target = os.path.join(self.asset_dir, new_name)
+            if filename in self.unrewritten:
+                if not os.path.exists(target):
+                    shutil.copyfile(source, target)
+                kept_count += 1
+            elif os.path.exists(target):
+                # Same digest prefix, same content: drop the extra copy
+                os.remove(source)
+                removed_count += 1
+            else:
+                os.rename(source, target)
+                renamed_count += 1
+        return renamed_count, removed_count, kept_count
+
+    def finish(self):
+        """Renames assets (if enabled) and prints the asset report."""
+        duplicates = self.duplicates()
+        orphans = self.orphans()
+        missing = self.missing()
+
+        print("\n--- Asset Report ---")
+        print(f"Assets hashed: {len(self.hashes())}")
+        print(f"Duplicate groups: {len(duplicates)}")
+        for group in duplicates:
+            print(f"  [Duplicate] {', '.join(group)}")
+        if self.rename_assets:
+            try:
+                renamed_count, removed_count, kept_count = self.apply_renames()
+                print(f"Renamed to content-addressed names: {renamed_count}")
+                print(f"Removed duplicate copies: {removed_count}")
+                print(f"Kept under old name (still used by it): {kept_count}")
+                for name, docs in sorted(self.unrewritten.items()):
+                    if self.renames().get(name, name) != name:
+                        print(f"  [Kept] {name} <- {', '.join(sorted(map(str, docs)))}")
+            except OSError as e:
+                print(f"[Error] Failed to rename assets: {e}")
+        print(f"Orphaned assets (not referenced): {len(orphans)}")
+        for name in orphans:
+            if self.rename_assets and self.renames()[name] != name:
+                print(f"  [Orphan] {self.renames()[name]} (was: {name})")
+            else:
+                print(f"  [Orphan] {name}")
+        print(f"Missing images (referenced, not found): {len(missing)}")
+        for name, docs in missing.items():
+            print(f"  [Missing] {name} <- {', '.join(docs)}")
+        print("-" * 20)
+
+
+# --- 主程序入口 ---
+if __name__ == "__main__":
+    docs_dir = os.path.join(BASE_DIR, DOCS_DIR_NAME)
+    stage = AssetStage(os.path.join(BASE_DIR, ASSET_DIR_NAME), rename_assets=False)
+    stage.start()
+    for root, _, files in os.walk(docs_dir):
+        for filename in files:
+            if filename.lower().endswith(".md"):
+                with open(os.path.join(root, filename), "r", encoding="utf-8") as f:
+                    stage.rewrite(f.read(), filename)
+    stage.finish()
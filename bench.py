@@ -0,0 +1,327 @@
+"""
+Benchmarks for the docs pipeline.
+
+    python bench.py bundle [docs_dir] [--copies N] [--lookups N]
+    python bench.py rss [--size-mb N]
+    python bench.py corpus [docs_dir] [--copies N]
+
+bundle: cold-start load of the corpus from the directory of .md files versus
+the packed bundle (bundle.py). The corpus is replicated N times into a
+temporary directory to emulate a large doc tree.
+
+rss: peak RSS and time of rewriting one large generated document, with the
+previous whole-file writers versus the streaming writers in rename.py and
+remove_title.py. Every variant runs in its own subprocess.
+
+corpus: memory held by a corpus kept in memory, as loose (front matter,
+body, names, warning strings) tuples versus document.Document records.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import remove_title
+from assets import AssetStage
+from bundle import BundleReader, write_bundle
+from document import Document, DocumentBatch, extract_front_matter
+from rename import front_matter_header, read_document, write_document
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DOCS_DIR = os.path.join(BASE_DIR, "docs")
+
+
+def _timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _replicate_corpus(docs_dir, work_dir, copies):
+    """Copies every .md file in docs_dir `copies` times into work_dir/docs."""
+    corpus_dir = os.path.join(work_dir, "docs")
+    os.makedirs(corpus_dir)
+    entries = []
+    for filename in sorted(os.listdir(docs_dir)):
+        if not filename.lower().endswith(".md"):
+            continue
+        source = os.path.join(docs_dir, filename)
+        with open(source, "r", encoding="utf-8") as f:
+            front_matter, _ = extract_front_matter(f.read())
+        for copy_index in range(copies):
+            name = f"{copy_index:05d}-{filename}"
+            target = os.path.join(corpus_dir, name)
+            shutil.copyfile(source, target)
+            entries.append(
+                (name, (front_matter or {}).get("standard_title"), front_matter, target)
+            )
+    return corpus_dir, entries
+
+
+def bench_bundle(docs_dir, copies, lookups, repeat=5):
+    with tempfile.TemporaryDirectory() as work_dir:
+        corpus_dir, entries = _replicate_corpus(docs_dir, work_dir, copies)
+        if not entries:
+            print(f"[Error] No Markdown files found in {docs_dir}")
+            return
+        names = [entry[0] for entry in entries]
+        sample = random.Random(0).sample(names, min(lookups, len(names)))
+
+        bundle_plain = os.path.join(work_dir, "plain.bundle")
+        bundle_zlib = os.path.join(work_dir, "zlib.bundle")
+        write_time, _ = _timed(lambda: write_bundle(entries, bundle_plain), 1)
+        write_bundle(entries, bundle_zlib, compress=True)
+
+        def load_dir_all():
+            # Current layout: walk the directory and read every file
+            total = 0
+            for filename in os.listdir(corpus_dir):
+                with open(os.path.join(corpus_dir, filename), "r", encoding="utf-8") as f:
+                    total += len(f.read())
+            return total
+
+        def load_dir_sample():
+            total = 0
+            for name in sample:
+                with open(os.path.join(corpus_dir, name), "r", encoding="utf-8") as f:
+                    total += len(f.read())
+            return total
+
+        def load_bundle_sample(path):
+            def run():
+                total = 0
+                with BundleReader(path) as reader:
+                    for name in sample:
+                        total += len(reader.read_document(name))
+                return total
+
+            return run
+
+        def open_bundle_first(path):
+            def run():
+                with BundleReader(path) as reader:
+                    return len(reader.read_document(sample[0]))
+
+            return run
+
+        dir_all, _ = _timed(load_dir_all, repeat)
+        dir_sample, _ = _timed(load_dir_sample, repeat)
+        plain_first, _ = _timed(open_bundle_first(bundle_plain), repeat)
+        plain_sample, _ = _timed(load_bundle_sample(bundle_plain), repeat)
+        zlib_sample, _ = _timed(load_bundle_sample(bundle_zlib), repeat)
+
+        corpus_bytes = sum(os.path.getsize(entry[3]) for entry in entries)
+        print("--- Bundle Benchmark ---")
+        print(f"Documents: {len(entries)} ({corpus_bytes / 1024:.0f} KiB)")
+        print(f"Bundle size: plain {os.path.getsize(bundle_plain) / 1024:.0f} KiB, "
+              f"zlib {os.path.getsize(bundle_zlib) / 1024:.0f} KiB")
+        rows = [
+            ("Bundle write", write_time),
+            ("Directory, read all files", dir_all),
+            (f"Directory, {len(sample)} lookups", dir_sample),
+            ("Bundle open + first lookup", plain_first),
+            (f"Bundle, {len(sample)} lookups", plain_sample),
+            (f"Bundle (zlib), {len(sample)} lookups", zlib_sample),
+        ]
+        for label, seconds in rows:
+            print(f"{label + ':':<32}{seconds * 1000:8.2f} ms")
+        print("-" * 24)
+
+
+# --- Memory of an in-memory corpus ---
+
+
+def _load_tuples(paths):
+    # Previous layout: the parsed tuple plus loose per-file name/warning values
+    corpus = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            front_matter, markdown_content = extract_front_matter(f.read())
+        document = Document(path, front_matter)
+        corpus.append(
+            (
+                front_matter,
+                markdown_content,
+                document.output_name,
+                document.sanitized_title,
+                document.lang_suffix,
+                document.warning_messages,
+            )
+        )
+    return corpus
+
+
+def _load_batch(keep_front_matter, keep_body):
+    def run(paths):
+        batch = DocumentBatch.load(paths, keep_front_matter, keep_body)
+        for document in batch:
+            document.output_name  # Derive (and cache) the names
+        return batch
+
+    return run
+
+
+def bench_corpus(docs_dir, copies):
+    with tempfile.TemporaryDirectory() as work_dir:
+        corpus_dir, entries = _replicate_corpus(docs_dir, work_dir, copies)
+        if not entries:
+            print(f"[Error] No Markdown files found in {docs_dir}")
+            return
+        paths = [entry[3] for entry in entries]
+
+        variants = [
+            ("Tuples + loose values", _load_tuples),
+            ("Document, front matter + body", _load_batch(True, True)),
+            ("Document, body only", _load_batch(False, True)),
+            ("Document, record only", _load_batch(False, False)),
+        ]
+        print("--- Corpus Memory Benchmark ---")
+        print(f"Documents: {len(paths)}")
+        baseline = None
+        for label, load in variants:
+            tracemalloc.start()
+            corpus = load(paths)
+            held, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del corpus
+            baseline = baseline or held
+            print(
+                f"{label + ':':<32}{held / 1024:10.0f} KiB{held / baseline:7.0%}"
+                f"{held / len(paths):8.0f} B/doc"
+            )
+        print("-" * 31)
+
+
+# --- Peak RSS of the document writers ---
+
+RSS_VARIANTS = [
+    ("baseline", "interpreter + imports only"),
+    ("legacy-rename", "rename.py, whole-file write"),
+    ("rename", "rename.py, streaming write"),
+    ("legacy-remove-title", "remove_title.py, whole-file write"),
+    ("remove-title", "remove_title.py, streaming write"),
+]
+
+
+def _generate_large_document(filepath, size_mb):
+    paragraph = (
+        "这里介绍供应商和各模型类型需要实现的接口方法和参数说明。"
+        "Each provider implements validate_provider_credentials and the model "
+        "interfaces described below, with `parameter_rules` and pricing.\n\n"
+    )
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(
+            "---\ndimensions:\n  type:\n    primary: reference\n    detail: core\n"
+            "  level: intermediate\nstandard_title: Generated Reference\n"
+            "language: en\n---\n\n# Generated Reference\n\n"
+        )
+        written = 0
+        while written < size_mb * 1024 * 1024:
+            f.write(paragraph)
+            written += len(paragraph.encode("utf-8"))
+
+
+def _rss_worker(variant, source, target):
+    """Runs one variant and prints its peak RSS in KiB and elapsed seconds."""
+    import resource
+
+    start = time.perf_counter()
+    if variant == "legacy-rename":
+        with open(source, "r", encoding="utf-8") as f:
+            content = f.read()
+        front_matter, markdown_content = extract_front_matter(content)
+        new_content = f"{front_matter_header(front_matter)}{markdown_content}"
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(new_content)
+    elif variant == "rename":
+        with open(source, "rb") as f:
+            front_matter, body_start, body_end = read_document(f)
+            asset_stage = AssetStage(os.path.join(os.path.dirname(target), "assets"), False)
+            write_document(
+                f, body_start, body_end, front_matter_header(front_matter), target, asset_stage, "bench"
+            )
+    elif variant == "legacy-remove-title":
+        shutil.copyfile(source, target)
+        start = time.perf_counter()
+        with open(target, "r", encoding="utf-8") as f:
+            content = f.read()
+        front_matter, markdown_content = extract_front_matter(content)
+        front_matter["title"] = "Generated Reference"
+        markdown_content = markdown_content.split("\n", 1)[1]
+        new_content = f"{front_matter_header(front_matter)}{markdown_content}"
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(new_content)
+    elif variant == "remove-title":
+        shutil.copyfile(source, target)
+        start = time.perf_counter()
+        remove_title.process_markdown_file(target)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024  # bytes on macOS, KiB elsewhere
+    print(f"{peak} {elapsed}")
+
+
+def bench_rss(size_mb):
+    with tempfile.TemporaryDirectory() as work_dir:
+        source = os.path.join(work_dir, "large.md")
+        _generate_large_document(source, size_mb)
+        print("--- Streaming Writer Benchmark ---")
+        print(f"Document: {os.path.getsize(source) / (1024 * 1024):.1f} MiB")
+        for variant, label in RSS_VARIANTS:
+            target = os.path.join(work_dir, f"{variant}.md")
+            result = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "_rss-worker", variant, source, target],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            peak_kib, elapsed = result.stdout.split()[-2:]
+            print(
+                f"{label + ':':<40}{int(peak_kib) / 1024:8.1f} MiB peak RSS"
+                f"{float(elapsed) * 1000:10.1f} ms"
+            )
+        print("-" * 34)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Docs pipeline benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bundle_parser = subparsers.add_parser("bundle", help="directory vs bundle load")
+    bundle_parser.add_argument("docs_dir", nargs="?", default=DEFAULT_DOCS_DIR)
+    bundle_parser.add_argument("--copies", type=int, default=100)
+    bundle_parser.add_argument("--lookups", type=int, default=200)
+
+    rss_parser = subparsers.add_parser("rss", help="peak RSS of the document writers")
+    rss_parser.add_argument("--size-mb", type=int, default=40)
+
+    corpus_parser = subparsers.add_parser("corpus", help="memory of an in-memory corpus")
+    corpus_parser.add_argument("docs_dir", nargs="?", default=DEFAULT_DOCS_DIR)
+    corpus_parser.add_argument("--copies", type=int, default=100)
+
+    worker_parser = subparsers.add_parser("_rss-worker")
+    worker_parser.add_argument("variant")
+    worker_parser.add_argument("source")
+    worker_parser.add_argument("target")
+
+    args = parser.parse_args()
+    if args.command == "bundle":
+        bench_bundle(args.docs_dir, args.copies, args.lookups)
+    elif args.command == "rss":
+        bench_rss(args.size_mb)
+    elif args.command == "corpus":
+        bench_corpus(args.docs_dir, args.copies)
+    elif args.command == "_rss-worker":
+        _rss_worker(args.variant, args.source, args.target)
@@ -0,0 +1,389 @@
+"""
+Packed single-file corpus bundle.
+
+Every document in docs/ (plus its parsed front matter) is packed into one
+file so doc servers can deploy and open a single file instead of thousands of
+small .md files. The reader memory-maps the bundle and looks documents up by
+output name or by standard_title with a binary search over fixed-width index
+entries, without loading the whole corpus.
+
+Layout (all integers little-endian):
+
+    header        magic, version, document count,
+                  offset of the name index, offset of the title index
+    data          per document: name, standard_title, front matter (JSON),
+                  document bytes (optionally zlib-compressed)
+    name index    one fixed-width entry per document, sorted by output name
+    title index   one u32 per document (position in the name index),
+                  sorted by standard_title, then output name
+
+The bundle is always built from the finished docs/ directory. rename.py
+builds it at the end of a run, and remove_title.py and changed.py rebuild it
+whenever they modify documents, so after the usual sequence
+
+    python rename.py && python remove_title.py
+
+it matches docs/. After editing docs/ by other means, rebuild it explicitly
+with "python bundle.py build" before deploying.
+
+Usage:
+    python bundle.py                       # list documents in docs.bundle
+    python bundle.py build [docs_dir]      # (re)build docs.bundle from docs/
+    python bundle.py <bundle> <name>       # print one document
+"""
+
+import datetime
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from document import parse_front_matter
+from streaming import COPY_CHUNK_SIZE, copy_range, file_size, read_front_matter
+
+# --- Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BUNDLE_NAME = "docs.bundle"
+DEFAULT_DOCS_DIR_NAME = "docs"
+BUNDLE_COMPRESS = False  # zlib-compress documents inside the bundle
+
+BUNDLE_MAGIC = b"DIFYDOCB"
+BUNDLE_VERSION = 1
+HEADER_STRUCT = struct.Struct("<8sIIQQ")
+# name_off, name_len, title_off, title_len, meta_off, meta_len,
+# body_off, body_len, raw_len, flags
+ENTRY_STRUCT = struct.Struct("<QIQIQIQIII")
+TITLE_ENTRY_STRUCT = struct.Struct("<I")
+FLAG_COMPRESSED = 1
+MIN_COMPRESS_SIZE = 512  # Smaller documents are never worth compressing
+# --- Configuration End ---
+
+
+def json_default(value):
+    # YAML front matter may contain dates; keep them readable in the bundle
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def write_bundle(entries, bundle_path, compress=False):
+    """
+    Packs documents into a bundle file and returns the number written.
+
+    entries: iterable of (output_name, standard_title, front_matter, filepath).
+    Documents are streamed from disk (copied by offset, or compressed in
+    chunks), so memory stays bounded by the index, not by document size. The
+    bundle is written to a temporary file and moved into place, so readers
+    never see a partial file.
+    """
+    records = []
+    seen_names = set()
+    tmp_path = f"{bundle_path}.tmp"
+
+    with open(tmp_path, "wb") as out:
+        out.write(b"\0" * HEADER_STRUCT.size)  # Placeholder, rewritten below
+
+        for output_name, standard_title, front_matter, filepath in entries:
+            if output_name in seen_names:
+                raise ValueError(f"Duplicate output name in bundle: {output_name}")
+            seen_names.add(output_name)
+
+            name_bytes = output_name.encode("utf-8")
+            title_bytes = str(standard_title or "").encode("utf-8")
+            meta_bytes = json.dumps(
+                front_matter or {}, ensure_ascii=False, default=json_default
+            ).encode("utf-8")
+            name_off = out.tell()
+            out.write(name_bytes)
+            title_off = out.tell()
+            out.write(title_bytes)
+            meta_off = out.tell()
+            out.write(meta_bytes)
+            body_off = out.tell()
+
+            flags = 0
+            with open(filepath, "rb") as f:
+                raw_len = file_size(f)
+                if compress and raw_len >= MIN_COMPRESS_SIZE:
+                    compressor = zlib.compressobj(6)
+                    for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b""):
+                        out.write(compressor.compress(chunk))
+                    out.write(compressor.flush())
+                    if out.tell() - body_off < raw_len:
+                        flags |= FLAG_COMPRESSED
+                    else:
+                        # Not worth it: store the document as is
+                        out.seek(body_off)
+                        out.truncate()
+                if not flags & FLAG_COMPRESSED:
+                    copy_range(f, out, 0, raw_len)
+                    out.seek(0, os.SEEK_END)
+            body_len = out.tell() - body_off
+
+            records.append(
+                (
+                    name_bytes,
+                    title_bytes,
+                    (
+                        name_off,
+                        len(name_bytes),
+                        title_off,
+                        len(title_bytes),
+                        meta_off,
+                        len(meta_bytes),
+                        body_off,
+                        body_len,
+                        raw_len,
+                        flags,
+                    ),
+                )
+            )
+
+        # --- Indexes ---
+        records.sort(key=lambda record: record[0])
+        name_index_off = out.tell()
+        for _, _, fields in records:
+            out.write(ENTRY_STRUCT.pack(*fields))
+
+        title_order = sorted(
+            range(len(records)), key=lambda i: (records[i][1], records[i][0])
+        )
+        title_index_off = out.tell()
+        for position in title_order:
+            out.write(TITLE_ENTRY_STRUCT.pack(position))
+
+        out.seek(0)
+        out.write(
+            HEADER_STRUCT.pack(
+                BUNDLE_MAGIC,
+                BUNDLE_VERSION,
+                len(records),
+                name_index_off,
+                title_index_off,
+            )
+        )
+
+    os.replace(tmp_path, bundle_path)
+    return len(records)
+
+
+def build_bundle(docs_dir, bundle_path=None, compress=BUNDLE_COMPRESS):
+    """
+    Packs every .md file under docs_dir, named by its path relative to
+    docs_dir, into a bundle (default: DEFAULT_BUNDLE_NAME). Returns the number
+    of documents written.
+    """
+    bundle_path = bundle_path or os.path.join(BASE_DIR, DEFAULT_BUNDLE_NAME)
+    entries = []
+    for root, dirs, files in os.walk(docs_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if not filename.lower().endswith(".md"):
+                continue
+            filepath = os.path.join(root, filename)
+            with open(filepath, "rb") as f:
+                yaml_bytes, _ = read_front_matter(f)
+            front_matter = {}
+            if yaml_bytes is not None:
+                front_matter = parse_front_matter(yaml_bytes.decode("utf-8").strip()) or {}
+            output_name = os.path.relpath(filepath, docs_dir).replace(os.sep, "/")
+            entries.append(
+                (output_name, front_matter.get("standard_title"), front_matter, filepath)
+            )
+    return write_bundle(entries, bundle_path, compress)
+
+
+def rebuild_bundle(docs_dir, bundle_path=None):
+    """build_bundle for the scripts: prints the result, reports errors instead of raising."""
+    bundle_path = bundle_path or os.path.join(BASE_DIR, DEFAULT_BUNDLE_NAME)
+    try:
+        bundle_count = build_bundle(docs_dir, bundle_path)
+        print(f"Bundled {bundle_count} documents into: {bundle_path}")
+        return True
+    except (OSError, ValueError) as e:
+        print(f"[Error] Failed to write bundle '{bundle_path}': {e}")
+        return False
+
+
+class BundleReader:
+    """
+    Memory-mapped, read-only view of a bundle written by write_bundle.
+
+    Lookups are O(log n) binary searches over the fixed-width indexes and only
+    touch the pages they need. document_view returns a zero-copy memoryview
+    for uncompressed documents.
+    """
+
+    def __init__(self, bundle_path):
+        self.path = bundle_path
+        self._file = open(bundle_path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file cannot be mapped
+            self._file.close()
+            raise ValueError(f"Not a bundle file: {bundle_path}")
+
+        magic, version, count, name_index_off, title_index_off = (
+            HEADER_STRUCT.unpack_from(self._mm, 0)
+            if len(self._mm) >= HEADER_STRUCT.size
+            else (b"", 0, 0, 0, 0)
+        )
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            self.close()
+            raise ValueError(f"Not a bundle file (or unsupported version): {bundle_path}")
+
+        self._count = count
+        self._name_index_off = name_index_off
+        self._title_index_off = title_index_off
+
+    # --- Context manager / lifetime ---
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # --- Low-level index access ---
+
+    def _entry(self, position):
+        return ENTRY_STRUCT.unpack_from(
+            self._mm, self._name_index_off + position * ENTRY_STRUCT.size
+        )
+
+    def _name_at(self, position):
+        entry = self._entry(position)
+        return self._mm[entry[0] : entry[0] + entry[1]]
+
+    def _title_at(self, position):
+        entry = self._entry(position)
+        return self._mm[entry[2] : entry[2] + entry[3]]
+
+    def _title_position(self, i):
+        return TITLE_ENTRY_STRUCT.unpack_from(
+            self._mm, self._title_index_off + i * TITLE_ENTRY_STRUCT.size
+        )[0]
+
+    def _find(self, output_name):
+        key = output_name.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._name_at(lo) == key:
+            return lo
+        return None
+
+    def _require(self, output_name):
+        position = self._find(output_name)
+        if position is None:
+            raise KeyError(output_name)
+        return self._entry(position)
+
+    # --- Public API ---
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, output_name):
+        return self._find(output_name) is not None
+
+    def names(self):
+        """Output names in sorted order."""
+        return [self._name_at(i).decode("utf-8") for i in range(self._count)]
+
+    def document_view(self, output_name):
+        """
+        Raw document bytes. Uncompressed documents are returned as a zero-copy
+        memoryview into the mapping (valid until close()).
+        """
+        entry = self._require(output_name)
+        body_off, body_len, flags = entry[6], entry[7], entry[9]
+        view = memoryview(self._mm)[body_off : body_off + body_len]
+        if flags & FLAG_COMPRESSED:
+            data = zlib.decompress(view)
+            view.release()
+            return memoryview(data)
+        return view
+
+    def read_document(self, output_name):
+        """Full document text (front matter header and body)."""
+        view = self.document_view(output_name)
+        try:
+            return str(view, "utf-8")
+        finally:
+            view.release()
+
+    def front_matter(self, output_name):
+        """Parsed front matter as stored at bundle time."""
+        entry = self._require(output_name)
+        return json.loads(self._mm[entry[4] : entry[4] + entry[5]].decode("utf-8"))
+
+    def standard_title(self, output_name):
+        entry = self._require(output_name)
+        return self._mm[entry[2] : entry[2] + entry[3]].decode("utf-8")
+
+    def find_by_title(self, standard_title):
+        """All output names whose standard_title matches exactly."""
+        key = str(standard_title).encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._title_at(self._title_position(mid)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        matches = []
+        while lo < self._count:
+            position = self._title_position(lo)
+            if self._title_at(position) != key:
+                break
+            matches.append(self._name_at(position).decode("utf-8"))
+            lo += 1
+        return matches
+
+
+# --- 主程序入口 ---
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        docs_dir = (
+            sys.argv[2] if len(sys.argv) > 2 else os.path.join(BASE_DIR, DEFAULT_DOCS_DIR_NAME)
+        )
+        if not os.path.isdir(docs_dir):
+            print(f"[Error] Docs directory not found: {docs_dir}")
+            sys.exit(1)
+        sys.exit(0 if rebuild_bundle(docs_dir) else 1)
+
+    bundle_path = (
+        sys.argv[1] if len(sys.argv) > 1 else os.path.join(BASE_DIR, DEFAULT_BUNDLE_NAME)
+    )
+    if not os.path.isfile(bundle_path):
+        print(f"[Error] Bundle not found: {bundle_path}")
+        sys.exit(1)
+
+    with BundleReader(bundle_path) as reader:
+        if len(sys.argv) > 2:
+            try:
+                sys.stdout.write(reader.read_document(sys.argv[2]))
+            except KeyError:
+                print(f"[Error] Document not found in bundle: {sys.argv[2]}")
+                sys.exit(1)
+        else:
+            for name in reader.names():
+                print(f"{name}\t{reader.standard_title(name)}")
+            print(f"{len(reader)} documents in {bundle_path}")
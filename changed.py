@@ -0,0 +1,300 @@
+"""
+Incremental rename.py / remove_title.py run for changed Markdown files only.
+
+Asks git which files under docs/ changed, instead of rebuilding the whole
+tree:
+
+    python changed.py                  # changed vs HEAD, plus untracked files
+    python changed.py --base main      # changed since a base ref
+    python changed.py --staged         # staged files only (pre-commit mode)
+    python changed.py --check          # report only, exit 1 if anything would change
+    python changed.py --install-hook   # install as .git/hooks/pre-commit
+
+Outside a git checkout, files modified since the last incremental run
+(STAMP_FILE_NAME) are selected instead.
+
+Each selected file gets the same output name (document.Document), header
+and title handling (find_title_patches) as a full run, and is renamed in place in
+docs/; its copy in docs_original_no_direct_edit is updated too. A file
+already holding the new output name is a collision: it is reported together
+with the changed file and the changed file is skipped, as in a full run.
+Moves are added to the redirect history (redirects.py), and docs.bundle is
+rebuilt when files were modified. The asset stage only runs in a full
+rename.py run.
+
+In pre-commit mode the hook fails when it had to modify files, so the
+updated files can be reviewed and staged before committing again.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from bundle import rebuild_bundle
+from document import Document
+from redirects import (
+    HISTORY_FILE_NAME,
+    TABLE_FILE_NAME,
+    RedirectHistory,
+    live_document_names,
+    no_number_name,
+)
+from remove_title import apply_patches, find_title_patches
+from rename import NO_NUMBER_DIR_NAME, TARGET_DIR_NAME, front_matter_header
+
+# --- Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCS_DIR = os.path.join(BASE_DIR, TARGET_DIR_NAME)
+NO_NUMBER_DIR = os.path.join(BASE_DIR, NO_NUMBER_DIR_NAME)
+STAMP_FILE_NAME = ".last_incremental_run"
+# --- Configuration End ---
+
+def _git(*args):
+    result = subprocess.run(
+        ["git", "-C", BASE_DIR, *args],
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout.decode("utf-8")
+
+
+def _split_z(output):
+    return [path for path in output.split("\0") if path]
+
+
+def git_changed_files(base_ref=None, staged=False):
+    """
+    Paths (relative to BASE_DIR) of added/copied/modified/renamed files.
+    Raises OSError / subprocess.CalledProcessError when git is unusable.
+    """
+    diff = ["diff", "--name-only", "--diff-filter=ACMR", "--relative", "-z"]
+    if staged:
+        return _split_z(_git(*diff, "--cached"))
+    paths = _split_z(_git(*diff, base_ref or "HEAD"))
+    paths += _split_z(_git("ls-files", "--others", "--exclude-standard", "-z"))
+    return paths
+
+
+def mtime_changed_files(docs_dir, stamp_path):
+    """Paths (relative to BASE_DIR) modified since the stamp file was touched."""
+    since = os.path.getmtime(stamp_path) if os.path.exists(stamp_path) else 0
+    paths = []
+    for root, _, files in os.walk(docs_dir):
+        for filename in files:
+            filepath = os.path.join(root, filename)
+            if os.path.getmtime(filepath) > since:
+                paths.append(os.path.relpath(filepath, BASE_DIR))
+    return paths
+
+
+def select_changed_markdown(base_ref=None, staged=False):
+    """Absolute paths of changed .md files under docs/."""
+    try:
+        paths = git_changed_files(base_ref, staged)
+        source = "git"
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, "stderr", b"") or b""
+        print(f"[Warning] git unavailable ({stderr.decode('utf-8', 'replace').strip() or e}).")
+        print("Falling back to file modification times.")
+        paths = mtime_changed_files(DOCS_DIR, os.path.join(BASE_DIR, STAMP_FILE_NAME))
+        source = "mtime"
+
+    docs_prefix = os.path.relpath(DOCS_DIR, BASE_DIR).replace(os.sep, "/") + "/"
+    selected = []
+    for path in paths:
+        path = path.replace(os.sep, "/")
+        if not path.startswith(docs_prefix) or not path.lower().endswith(".md"):
+            continue
+        filepath = os.path.join(BASE_DIR, path)
+        if os.path.isfile(filepath):
+            selected.append(filepath)
+    return sorted(set(selected)), source
+
+
+def _dump(document):
+    return front_matter_header(document.front_matter) + document.body
+
+
+def _relative(filepath):
+    return os.path.relpath(filepath, BASE_DIR).replace(os.sep, "/")
+
+
+def _read_if_exists(filepath):
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def process_changed_files(paths, docs_dir, no_number_dir, check=False, redirects=None):
+    """
+    Renames / rewrites the given docs in place. Returns a dict of counters and
+    the list of paths that were (or, with check=True, would be) modified.
+    Moves are recorded in the RedirectHistory passed as redirects.
+    """
+    counts = {"processed": 0, "unchanged": 0, "skipped": 0, "errors": 0, "warnings": 0}
+    modified = []
+    claimed = {}  # new output name -> path that claimed it in this run
+
+    for filepath in paths:
+        filename = os.path.basename(filepath)
+        relative_path = os.path.relpath(filepath, BASE_DIR).replace(os.sep, "/")
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                content = f.read()
+
+            document = Document.from_text(filepath, content)
+            if document is None:
+                print(f"\nProcessing: {relative_path}")
+                print("  [Skipping] YAML Error in file.")
+                counts["errors"] += 1
+                continue
+
+            try:
+                new_filename = document.output_name
+            except ValueError as e:
+                print(f"\nProcessing: {relative_path}")
+                print(f"  [Error] {e}")
+                counts["errors"] += 1
+                continue
+
+            # Same output as rename.py followed by remove_title.py
+            renamed_content = _dump(document)
+            renamed_data = renamed_content.encode("utf-8")
+            final_content = apply_patches(
+                renamed_data, find_title_patches(renamed_data)
+            ).decode("utf-8")
+
+            # --- Check for Collisions ---
+            target_filepath = os.path.join(docs_dir, new_filename)
+            is_same_file = os.path.abspath(target_filepath) == os.path.abspath(filepath)
+            if not is_same_file and (
+                os.path.exists(target_filepath) or new_filename in claimed
+            ):
+                holder = claimed.get(new_filename, target_filepath)
+                print(f"\nProcessing: {relative_path}")
+                print(f"  [Skipping] Target file already exists: {new_filename}")
+                print(f"  [Collision] with {os.path.relpath(holder, BASE_DIR).replace(os.sep, '/')}")
+                counts["skipped"] += 1
+                continue
+            claimed[new_filename] = filepath
+
+            if document.warnings:
+                print(f"\nProcessing: {relative_path}")
+                for warning in document.warning_messages:
+                    print(warning)
+                counts["warnings"] += 1
+
+            # --- No-number copy ---
+            old_no_number = no_number_name(filename)
+            no_number_filename = document.no_number_name
+            no_number_filepath = os.path.join(no_number_dir, no_number_filename)
+            if no_number_filename != old_no_number and os.path.exists(no_number_filepath):
+                no_number_filename = f"{document.sanitized_title}-dup{document.lang_suffix}.md"
+                no_number_filepath = os.path.join(no_number_dir, no_number_filename)
+
+            changes = []
+            if not is_same_file or content != final_content:
+                changes.append((target_filepath, final_content))
+            if os.path.isdir(no_number_dir) and _read_if_exists(no_number_filepath) != renamed_content:
+                changes.append((no_number_filepath, renamed_content))
+            stale = []
+            if not is_same_file:
+                stale.append(filepath)
+            if old_no_number and old_no_number != no_number_filename:
+                old_no_number_path = os.path.join(no_number_dir, old_no_number)
+                if os.path.exists(old_no_number_path):
+                    stale.append(old_no_number_path)
+
+            if not changes and not stale:
+                counts["unchanged"] += 1
+                continue
+
+            modified.append(target_filepath)
+            if check:
+                print(f"[Would change] {relative_path} -> {new_filename}")
+            else:
+                for path, new_content in changes:
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(new_content)
+                for path in stale:
+                    os.remove(path)
+                if redirects is not None:
+                    redirects.record(_relative(filepath), _relative(target_filepath))
+                    if old_no_number:
+                        redirects.record(
+                            _relative(os.path.join(no_number_dir, old_no_number)),
+                            _relative(no_number_filepath),
+                        )
+                print(f"[Processed] {relative_path} -> {new_filename}")
+            counts["processed"] += 1
+
+        except Exception as e:
+            print(f"\nProcessing: {relative_path}")
+            print(f"  [Error] Unexpected error processing file '{relative_path}': {e}")
+            counts["errors"] += 1
+
+    return counts, modified
+
+
+def install_hook():
+    hooks_dir = os.path.join(BASE_DIR, _git("rev-parse", "--git-path", "hooks").strip())
+    prefix = _git("rev-parse", "--show-prefix").strip()
+    hook_path = os.path.join(hooks_dir, "pre-commit")
+    if os.path.exists(hook_path):
+        print(f"[Error] A pre-commit hook already exists: {hook_path}")
+        return False
+    os.makedirs(hooks_dir, exist_ok=True)
+    with open(hook_path, "w", encoding="utf-8") as f:
+        f.write("#!/bin/sh\n")
+        f.write(f'exec python "$(git rev-parse --show-toplevel)/{prefix}changed.py" --staged\n')
+    os.chmod(hook_path, 0o755)
+    print(f"Installed pre-commit hook: {hook_path}")
+    return True
+
+
+# --- 主程序入口 ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process changed Markdown files only")
+    parser.add_argument("--base", help="git ref to diff against (default: HEAD)")
+    parser.add_argument("--staged", action="store_true", help="staged files only (pre-commit)")
+    parser.add_argument("--check", action="store_true", help="do not write, only report")
+    parser.add_argument("--install-hook", action="store_true")
+    args = parser.parse_args()
+
+    if args.install_hook:
+        sys.exit(0 if install_hook() else 1)
+
+    start = time.perf_counter()
+    paths, source = select_changed_markdown(args.base, args.staged)
+    redirects = RedirectHistory(os.path.join(BASE_DIR, HISTORY_FILE_NAME))
+    counts, modified = process_changed_files(
+        paths, DOCS_DIR, NO_NUMBER_DIR, args.check, redirects
+    )
+    if counts["processed"] and not args.check:
+        live_names = live_document_names(TARGET_DIR_NAME, NO_NUMBER_DIR_NAME)
+        redirects.save(live_names)
+        redirects.write_table(os.path.join(BASE_DIR, TABLE_FILE_NAME), live_names)
+        rebuild_bundle(DOCS_DIR)
+    if source == "mtime" and not args.check:
+        with open(os.path.join(BASE_DIR, STAMP_FILE_NAME), "w", encoding="utf-8"):
+            pass
+    elapsed = time.perf_counter() - start
+
+    print("\n--- Incremental Run Complete ---")
+    print(f"Changed Markdown files ({source}): {len(paths)}")
+    print(f"{'Would be modified' if args.check else 'Modified'}: {counts['processed']}")
+    print(f"Already up to date: {counts['unchanged']}")
+    print(f"Skipped (collision): {counts['skipped']}")
+    print(f"Files with warnings: {counts['warnings']}")
+    print(f"Errors encountered: {counts['errors']}")
+    print(f"Elapsed: {elapsed * 1000:.0f} ms")
+    print("-" * 32)
+
+    if (args.staged or args.check) and (modified or counts["skipped"] or counts["errors"]):
+        if args.staged and not args.check and modified:
+            print("Files were updated. Review and stage them, then commit again.")
+        sys.exit(1)
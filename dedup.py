@@ -0,0 +1,240 @@
+"""
+Exact and near-duplicate detection for Markdown documents.
+
+Finds copies that pile up in the tree: docs/ mirrored into
+docs_original_no_direct_edit, archived docs_* directories, and -dup files
+written when titles collide in rename.py.
+
+- Bodies (front matter removed) are tokenised CJK-aware: every Han / Kana /
+  Hangul character is a token, Latin words and numbers are tokens. Shingles
+  are runs of SHINGLE_SIZE tokens.
+- Each document gets a MinHash signature using one-permutation hashing
+  (every shingle hash goes to one of NUM_PERM bins, each bin keeps its
+  minimum; empty bins are filled from the next non-empty bin). This costs
+  one hash per shingle instead of NUM_PERM.
+- LSH banding (BANDS bands of ROWS rows) buckets signatures, so only
+  documents sharing a band are compared: sub-quadratic in corpus size.
+- Candidate pairs whose estimated Jaccard similarity reaches the threshold
+  are merged into clusters. Identical bodies are reported as exact.
+
+Usage:
+    python dedup.py [dir ...] [--threshold 0.8]
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import struct
+from collections import defaultdict
+
+from document import Document
+
+# --- Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.8
+# --- Configuration End ---
+
+MAX_HASH = (1 << 64) - 1
+CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+TOKEN_RE = re.compile(
+    rf"[{CJK_RANGES}]"  # One token per CJK character
+    rf"|[^\W_{CJK_RANGES}]+"  # Latin words / numbers
+)
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def shingle_hashes(text):
+    """64-bit hashes of the document's token shingles."""
+    tokens = tokenize(text)
+    if len(tokens) < SHINGLE_SIZE:
+        tokens = tokens and [" ".join(tokens)]
+        width = 1
+    else:
+        width = SHINGLE_SIZE
+    hashes = set()
+    for i in range(len(tokens) - width + 1):
+        shingle = " ".join(tokens[i : i + width]).encode("utf-8")
+        hashes.add(
+            struct.unpack("<Q", hashlib.blake2b(shingle, digest_size=8).digest())[0]
+        )
+    return hashes
+
+
+def minhash_signature(hashes):
+    """
+    One-permutation MinHash with rotation densification. Returns a tuple of
+    NUM_PERM values, or None for documents without any shingle.
+    """
+    if not hashes:
+        return None
+    bins = [MAX_HASH] * NUM_PERM
+    for value in hashes:
+        index = value % NUM_PERM
+        rest = value // NUM_PERM
+        if rest < bins[index]:
+            bins[index] = rest
+
+    # Fill empty bins from the next non-empty bin (circularly), with an offset
+    # so filled bins do not look like real collisions
+    filled = list(bins)
+    for index in range(NUM_PERM):
+        if bins[index] != MAX_HASH:
+            continue
+        step = 1
+        while bins[(index + step) % NUM_PERM] == MAX_HASH:
+            step += 1
+        filled[index] = bins[(index + step) % NUM_PERM] + step * (MAX_HASH // NUM_PERM)
+    return tuple(filled)
+
+
+def estimate_similarity(signature_a, signature_b):
+    same = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return same / NUM_PERM
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def read_body(filepath):
+    with open(filepath, "r", encoding="utf-8") as f:
+        content = f.read()
+    document = Document.from_text(filepath, content, keep_front_matter=False)
+    return document.body if document is not None else content
+
+
+def find_duplicates(paths, threshold=DEFAULT_THRESHOLD):
+    """
+    Returns clusters of duplicate documents as a list of dicts:
+        {"paths": [...], "exact": bool, "similarity": min pairwise estimate}
+    sorted by cluster size, largest first.
+    """
+    signatures = {}
+    body_hashes = {}
+    exact_groups = defaultdict(list)
+    for path in paths:
+        try:
+            body = read_body(path)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  [Warning] Could not read '{path}': {e}")
+            continue
+        normalized = WHITESPACE_RE.sub(" ", body).strip()
+        body_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        body_hashes[path] = body_hash
+        exact_groups[body_hash].append(path)
+        signature = minhash_signature(shingle_hashes(normalized))
+        if signature is not None:
+            signatures[path] = signature
+
+    union_find = _UnionFind()
+    pair_similarity = {}
+
+    # Identical bodies: one representative goes through LSH
+    for group in exact_groups.values():
+        for path in group[1:]:
+            union_find.union(group[0], path)
+            pair_similarity[(group[0], path)] = 1.0
+            signatures.pop(path, None)
+
+    # --- LSH banding ---
+    buckets = defaultdict(list)
+    for path, signature in signatures.items():
+        for band in range(BANDS):
+            key = (band, signature[band * ROWS : (band + 1) * ROWS])
+            buckets[key].append(path)
+
+    compared = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for i, path_a in enumerate(members):
+            for path_b in members[i + 1 :]:
+                pair = (path_a, path_b) if path_a < path_b else (path_b, path_a)
+                if pair in compared:
+                    continue
+                compared.add(pair)
+                similarity = estimate_similarity(signatures[path_a], signatures[path_b])
+                if similarity >= threshold:
+                    union_find.union(path_a, path_b)
+                    pair_similarity[pair] = similarity
+
+    clusters = defaultdict(list)
+    for path in union_find.parent:
+        clusters[union_find.find(path)].append(path)
+
+    lowest = defaultdict(lambda: 1.0)
+    for (path_a, _), similarity in pair_similarity.items():
+        root = union_find.find(path_a)
+        lowest[root] = min(lowest[root], similarity)
+
+    result = []
+    for root, members in clusters.items():
+        if len(members) < 2:
+            continue
+        result.append(
+            {
+                "paths": sorted(members),
+                "exact": len({body_hashes[path] for path in members}) == 1,
+                "similarity": lowest[root],
+            }
+        )
+    result.sort(key=lambda cluster: (-len(cluster["paths"]), cluster["paths"]))
+    return result
+
+
+def collect_markdown_files(roots):
+    paths = []
+    for root_dir in roots:
+        for root, dirs, files in os.walk(root_dir):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for filename in sorted(files):
+                if filename.lower().endswith(".md"):
+                    paths.append(os.path.join(root, filename))
+    return paths
+
+
+# --- 主程序入口 ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find duplicate Markdown documents")
+    parser.add_argument("roots", nargs="*", default=[BASE_DIR])
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    paths = collect_markdown_files(args.roots)
+    print(f"Scanning {len(paths)} Markdown files...")
+    clusters = find_duplicates(paths, args.threshold)
+
+    for number, cluster in enumerate(clusters, 1):
+        kind = "exact" if cluster["exact"] else f"near, >= {cluster['similarity']:.2f}"
+        print(f"\nCluster {number} ({len(cluster['paths'])} files, {kind}):")
+        for path in cluster["paths"]:
+            print(f"  {os.path.relpath(path, BASE_DIR).replace(os.sep, '/')}")
+
+    print("\n--- Duplicate Report ---")
+    print(f"Files scanned: {len(paths)}")
+    print(f"Exact clusters: {sum(1 for c in clusters if c['exact'])}")
+    print(f"Near-duplicate clusters: {sum(1 for c in clusters if not c['exact'])}")
+    print(f"Files in clusters: {sum(len(c['paths']) for c in clusters)}")
+    print("-" * 24)
@@ -0,0 +1,381 @@
+"""
+Shared document record for the docs scripts.
+
+rename.py, shard.py, changed.py, schema.py and dedup.py all read a document
+as front matter + body and derive the same things from it: the PWXY prefix,
+the sanitized title, the output names and the warnings about missing or
+unmapped taxonomy data. Document holds one document in a __slots__ record:
+
+- dimension values (primary, detail, level) and the language are interned,
+  so a corpus keeps one string per distinct value,
+- warnings are (code, *values) tuples, rendered to text only when printed
+  (format_warning),
+- derived fields are computed on first access and cached,
+- the full front matter dict and the body are only kept when asked for.
+
+The record itself saves little: with front matter and body kept, a corpus of
+Documents takes about as much memory as the plain tuples it replaces
+(bench.py corpus). The saving comes from not keeping the front matter and
+body (keep_front_matter / keep_body), which only helps callers that need no
+more than the record fields.
+
+DocumentBatch holds a loaded corpus of Documents with an output-name index.
+No script uses it yet.
+"""
+
+import os
+import re
+import sys
+from collections.abc import Hashable
+
+import yaml
+
+# --- Mapping Configuration ---
+PRIMARY_TYPE_MAP = {
+    "conceptual": 1,
+    "implementation": 2,
+    "operational": 3,
+    "reference": 4,
+}
+DEFAULT_W = 0
+DETAIL_TYPE_MAPS = {
+    "conceptual": {"introduction": 1, "principles": 2, "architecture": 3},
+    "implementation": {"basic": 1, "standard": 2, "high": 3, "advanced": 4},
+    "operational": {"setup": 1, "deployment": 2, "maintenance": 3},
+    "reference": {"core": 1, "configuration": 2, "examples": 3},
+}
+DEFAULT_X = 0
+LEVEL_MAP = {
+    "beginner": 1,
+    "intermediate": 2,
+    "advanced": 3,
+}
+DEFAULT_Y = 0
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 9
+PRIORITY_ADVANCED_LEVEL_KEY = "advanced"
+PRIORITY_IMPLEMENTATION_PRIMARY_KEY = "implementation"
+PRIORITY_IMPLEMENTATION_DETAIL_KEYS = {"high", "advanced"}
+# --- Configuration End ---
+
+# --- Warning Codes ---
+WARN_MISSING_PRIMARY = "W001"
+WARN_UNMAPPED_PRIMARY = "W002"
+WARN_MISSING_DETAIL = "W003"
+WARN_UNMAPPED_DETAIL = "W004"
+WARN_NO_DETAIL_MAP = "W005"
+WARN_MISSING_LEVEL = "W006"
+WARN_UNMAPPED_LEVEL = "W007"
+WARN_MISSING_TITLE = "W008"
+WARN_EMPTY_LANGUAGE = "W009"
+WARN_MISSING_LANGUAGE = "W010"
+
+WARNING_MESSAGES = {
+    WARN_MISSING_PRIMARY: "Missing dimensions.type.primary",
+    WARN_UNMAPPED_PRIMARY: f"Unmapped primary type: '{{0}}'. Using W={DEFAULT_W}",
+    WARN_MISSING_DETAIL: "Missing dimensions.type.detail",
+    WARN_UNMAPPED_DETAIL: f"Unmapped detail type: '{{0}}' for primary '{{1}}'. Using X={DEFAULT_X}",
+    WARN_NO_DETAIL_MAP: f"No detail map defined for primary type: '{{0}}'. Using X={DEFAULT_X}",
+    WARN_MISSING_LEVEL: "Missing dimensions.level",
+    WARN_UNMAPPED_LEVEL: f"Unmapped level: '{{0}}'. Using Y={DEFAULT_Y}",
+    WARN_MISSING_TITLE: "Missing 'standard_title'. Using original filename base as fallback.",
+    WARN_EMPTY_LANGUAGE: "Empty 'language' field found. Omitting suffix.",
+    WARN_MISSING_LANGUAGE: "Missing 'language' field. Omitting suffix.",
+}
+
+MALFORMED = object()  # 'dimensions' / 'dimensions.type' is not a mapping, or a value in it is a list / mapping
+
+
+def format_warning(warning):
+    """(code, *values) -> the '  [Warning] ...' line printed by the scripts."""
+    code, *values = warning
+    return f"  [Warning] {WARNING_MESSAGES[code].format(*values)}"
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# --- Parsing ---
+
+
+def parse_front_matter(yaml_str):
+    """Parses a front matter YAML string; returns None on YAML errors."""
+    try:
+        front_matter = yaml.safe_load(yaml_str)
+    except yaml.YAMLError as e:
+        print(f"  [Error] YAML Parsing Failed: {e}")
+        return None
+    return front_matter if isinstance(front_matter, dict) else {}
+
+
+def extract_front_matter(content):
+    match = re.match(r"^\s*---\s*$(.*?)^---\s*$(.*)", content, re.DOTALL | re.MULTILINE)
+    if match:
+        yaml_str = match.group(1).strip()
+        markdown_content = match.group(2).strip()
+        front_matter = parse_front_matter(yaml_str)
+        if front_matter is None:
+            return None, content
+        return front_matter, markdown_content
+    else:
+        return {}, content
+
+
+def sanitize_filename_part(part):
+    if not isinstance(part, str):
+        part = str(part)
+    part = part.lower()
+    # Replace common problematic characters first
+    part = part.replace("&", "and").replace("@", "at")
+    part = re.sub(r"\s+", "-", part)  # Whitespace to hyphen
+    # Keep letters, numbers, underscore, hyphen. Remove others.
+    part = re.sub(r"[^\w\-]+", "", part)
+    part = part.strip(".-_")  # Remove leading/trailing separators
+    # Ensure it's not empty, provide a default if it becomes empty
+    return part or "untitled"
+
+
+# --- Record Types ---
+
+
+class Document:
+    """
+    One document: the front matter fields the scripts use plus lazily derived
+    output names. front_matter / body are None unless kept.
+    """
+
+    __slots__ = (
+        "path",
+        "standard_title",
+        "language",
+        "primary",
+        "detail",
+        "level",
+        "previous_name",
+        "front_matter",
+        "body",
+        "_prefix",
+        "_sanitized_title",
+        "_lang_suffix",
+        "_warnings",
+    )
+
+    def __init__(self, path, front_matter, body=None, keep_front_matter=True):
+        dimensions = front_matter.get("dimensions", {})
+        type_info = dimensions.get("type", {}) if isinstance(dimensions, dict) else None
+        values = (
+            (type_info.get("primary"), type_info.get("detail"), dimensions.get("level"))
+            if isinstance(type_info, dict)
+            else ()
+        )
+        # The values are looked up in the mapping dicts, so they must be hashable
+        if values and all(isinstance(value, Hashable) for value in values):
+            self.primary, self.detail, self.level = (_intern(value) for value in values)
+        else:
+            self.primary = self.detail = self.level = MALFORMED
+        self.path = path
+        self.standard_title = front_matter.get("standard_title")
+        self.language = _intern(front_matter.get("language"))
+        self.previous_name = front_matter.get("previous_name")
+        self.front_matter = front_matter if keep_front_matter else None
+        self.body = body
+        self._prefix = None
+        self._sanitized_title = None
+        self._lang_suffix = None
+        self._warnings = None
+
+    @classmethod
+    def from_text(cls, path, content, keep_front_matter=True, keep_body=True):
+        """Parses a document's text; returns None on YAML errors."""
+        front_matter, markdown_content = extract_front_matter(content)
+        if front_matter is None:
+            return None
+        return cls(path, front_matter, markdown_content if keep_body else None, keep_front_matter)
+
+    @classmethod
+    def load(cls, path, keep_front_matter=True, keep_body=True):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_text(path, f.read(), keep_front_matter, keep_body)
+
+    def __repr__(self):
+        return f"Document({self.path!r})"
+
+    @property
+    def filename(self):
+        return os.path.basename(self.path)
+
+    def _derive(self):
+        """
+        Computes the PWXY prefix, sanitized title, language suffix and
+        warnings in one pass. Raises ValueError if no prefix can be formed.
+        """
+        primary, detail, level = self.primary, self.detail, self.level
+        if primary is MALFORMED:
+            raise ValueError("Malformed 'dimensions' in front matter.")
+        warnings = []
+
+        # P: priority, W: primary type, X: detail type, Y: level
+        priority = PRIORITY_NORMAL
+        if level == PRIORITY_ADVANCED_LEVEL_KEY:
+            priority = PRIORITY_HIGH
+        if (
+            primary == PRIORITY_IMPLEMENTATION_PRIMARY_KEY
+            and detail in PRIORITY_IMPLEMENTATION_DETAIL_KEYS
+        ):
+            priority = PRIORITY_HIGH
+
+        type_digit = PRIMARY_TYPE_MAP.get(primary, DEFAULT_W)
+        detail_digit = DETAIL_TYPE_MAPS.get(primary, {}).get(detail, DEFAULT_X)
+        level_digit = LEVEL_MAP.get(level, DEFAULT_Y)
+
+        if primary is None:
+            warnings.append((WARN_MISSING_PRIMARY,))
+        elif type_digit == DEFAULT_W:
+            warnings.append((WARN_UNMAPPED_PRIMARY, primary))
+        if detail is None:
+            warnings.append((WARN_MISSING_DETAIL,))
+        elif detail_digit == DEFAULT_X and primary in DETAIL_TYPE_MAPS:
+            warnings.append((WARN_UNMAPPED_DETAIL, detail, primary))
+        elif primary not in DETAIL_TYPE_MAPS and primary is not None:
+            warnings.append((WARN_NO_DETAIL_MAP, primary))
+        if level is None:
+            warnings.append((WARN_MISSING_LEVEL,))
+        elif level_digit == DEFAULT_Y:
+            warnings.append((WARN_UNMAPPED_LEVEL, level))
+
+        prefix_str = f"{priority}{type_digit}{detail_digit}{level_digit}"
+        try:
+            numeric_prefix = int(prefix_str)
+        except ValueError:
+            raise ValueError(
+                f"Could not form numeric prefix from P={priority}, W={type_digit}, X={detail_digit}, Y={level_digit}."
+            )
+
+        title_part = self.standard_title
+        if not title_part:
+            warnings.append((WARN_MISSING_TITLE,))
+            title_part = os.path.splitext(self.filename)[0]  # Fallback
+
+        lang_suffix = ""
+        if self.language:
+            lang_code = str(self.language).strip().lower()
+            if lang_code:
+                lang_suffix = _intern(f".{lang_code}")
+            else:
+                warnings.append((WARN_EMPTY_LANGUAGE,))
+        else:
+            warnings.append((WARN_MISSING_LANGUAGE,))
+
+        self._prefix = f"{numeric_prefix:04d}"
+        self._sanitized_title = sanitize_filename_part(title_part)
+        self._lang_suffix = lang_suffix
+        self._warnings = tuple(warnings)
+
+    @property
+    def prefix(self):
+        """Zero-padded PWXY prefix, e.g. '0131'."""
+        if self._prefix is None:
+            self._derive()
+        return self._prefix
+
+    @property
+    def sanitized_title(self):
+        if self._prefix is None:
+            self._derive()
+        return self._sanitized_title
+
+    @property
+    def lang_suffix(self):
+        """'.zh' etc., or '' when the document has no language."""
+        if self._prefix is None:
+            self._derive()
+        return self._lang_suffix
+
+    @property
+    def warnings(self):
+        """Tuple of (code, *values) warnings about missing / unmapped data."""
+        if self._prefix is None:
+            self._derive()
+        return self._warnings
+
+    @property
+    def warning_messages(self):
+        return [format_warning(warning) for warning in self.warnings]
+
+    @property
+    def output_name(self):
+        """PWXY-[title].lang.md"""
+        return f"{self.prefix}-[{self.sanitized_title}]{self.lang_suffix}.md"
+
+    @property
+    def no_number_name(self):
+        """title.lang.md, the name in docs_original_no_direct_edit."""
+        return f"{self.sanitized_title}{self.lang_suffix}.md"
+
+
+class DocumentBatch:
+    """
+    A corpus of Documents in load order. Documents whose output name cannot be
+    formed are kept but left out of the output-name index.
+    """
+
+    __slots__ = ("documents", "errors", "_by_output_name")
+
+    def __init__(self, documents=()):
+        self.documents = list(documents)
+        self.errors = []  # (path, message) of files that could not be loaded
+        self._by_output_name = None
+
+    @classmethod
+    def load(cls, paths, keep_front_matter=False, keep_body=False):
+        """Loads documents; by default only the fields the record holds are kept."""
+        batch = cls()
+        for path in paths:
+            try:
+                document = Document.load(path, keep_front_matter, keep_body)
+            except (OSError, UnicodeDecodeError) as e:
+                batch.errors.append((path, str(e)))
+                continue
+            if document is None:
+                batch.errors.append((path, "YAML parsing failed"))
+                continue
+            batch.append(document)
+        return batch
+
+    def append(self, document):
+        self.documents.append(document)
+        self._by_output_name = None
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __iter__(self):
+        return iter(self.documents)
+
+    def __getitem__(self, index):
+        return self.documents[index]
+
+    def _index(self):
+        if self._by_output_name is None:
+            index = {}
+            for document in self.documents:
+                try:
+                    index.setdefault(document.output_name, []).append(document)
+                except ValueError:
+                    continue
+            self._by_output_name = index
+        return self._by_output_name
+
+    def find(self, output_name):
+        """The first document (in load order) with this output name, or None."""
+        documents = self._index().get(output_name)
+        return documents[0] if documents else None
+
+    def collisions(self):
+        """Output name -> documents, for names claimed by more than one document."""
+        return {
+            name: documents
+            for name, documents in self._index().items()
+            if len(documents) > 1
+        }
@@ -0,0 +1,166 @@
+"""
+Redirect map for renamed documents.
+
+Every rename.py / changed.py run can change output names (taxonomy or
+standard_title changes), which breaks published URLs. Both runs record each
+old name -> new name move from their rename plan into a persistent history
+(HISTORY_FILE_NAME, committed with the docs). previous_name entries in front
+matter (written by used_temp_tools/deprecated.rename.py) are recorded too.
+
+Before writing, chains are collapsed (a -> b -> c becomes a -> c and b -> c),
+moves back to a name in use and chains ending in a cycle are dropped, and
+names that are live documents again never redirect. The table only lists
+redirects whose target is a live document. The result is written as a sorted tab-separated table
+(TABLE_FILE_NAME) that a web server loads once into a hash map
+(load_redirect_table) and resolves in O(1).
+
+Paths are relative to the repository root, e.g.
+    docs/0331-[faq].zh.md -> docs/0331-[faq-page].zh.md
+
+Usage:
+    python redirects.py                # rewrite the table from the history
+    python redirects.py <path>         # resolve one path
+"""
+
+import json
+import os
+import re
+import sys
+
+# --- Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE_NAME = "redirect_history.json"
+TABLE_FILE_NAME = "redirects.tsv"
+# --- Configuration End ---
+
+OUTPUT_NAME_RE = re.compile(r"^\d{4}-\[(.+)\](\.[^.]+)?\.md$")
+
+
+def no_number_name(output_filename):
+    """'0331-[faq].zh.md' -> 'faq.zh.md'; None if not a PWXY output name."""
+    match = OUTPUT_NAME_RE.match(output_filename)
+    if not match:
+        return None
+    return f"{match.group(1)}{match.group(2) or ''}.md"
+
+
+class RedirectHistory:
+    """Persistent old -> new name history with chain collapsing."""
+
+    def __init__(self, history_path):
+        self.history_path = history_path
+        self.moves = {}
+        try:
+            with open(history_path, "r", encoding="utf-8") as f:
+                self.moves = json.load(f).get("redirects", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"[Warning] Could not read redirect history '{history_path}': {e}")
+
+    def record(self, old, new):
+        if old and new and old != new:
+            self.moves[old] = new
+
+    def collapsed(self, live_names=()):
+        """
+        Returns {old: final name} with every chain resolved to its end.
+        Names in live_names are current documents and never redirect. A chain
+        that runs into a cycle ends nowhere and is dropped as a whole, so the
+        result does not depend on the order the moves were recorded in.
+        """
+        live = set(live_names)
+        resolved = {}
+        for old in self.moves:
+            if old in live or old in resolved:
+                continue
+            chain = [old]
+            seen = {old}
+            current = self.moves[old]
+            while True:
+                if current in resolved:
+                    final = resolved[current]  # None if that chain was a cycle
+                    break
+                if current in live or current not in self.moves:
+                    final = current
+                    break
+                if current in seen:
+                    final = None
+                    break
+                chain.append(current)
+                seen.add(current)
+                current = self.moves[current]
+            for name in chain:
+                resolved[name] = final
+        return {old: new for old, new in resolved.items() if new is not None and new != old}
+
+    def save(self, live_names=()):
+        """Stores the collapsed history so it does not grow with chains."""
+        self.moves = self.collapsed(live_names)
+        tmp_path = f"{self.history_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": 1, "redirects": dict(sorted(self.moves.items()))},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+            f.write("\n")
+        os.replace(tmp_path, self.history_path)
+
+    def write_table(self, table_path, live_names=()):
+        """
+        Writes the sorted old<TAB>new table; returns the number of entries.
+        Only redirects to documents in live_names are written, so the table
+        never points at a missing page (the history keeps the others).
+        """
+        live = set(live_names)
+        redirects = {
+            old: new for old, new in self.collapsed(live).items() if new in live
+        }
+        tmp_path = f"{table_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for old, new in sorted(redirects.items()):
+                f.write(f"{old}\t{new}\n")
+        os.replace(tmp_path, table_path)
+        return len(redirects)
+
+
+def load_redirect_table(table_path):
+    """Loads a table written by write_table into a dict for O(1) lookups."""
+    table = {}
+    with open(table_path, "r", encoding="utf-8") as f:
+        for line in f:
+            old, sep, new = line.rstrip("\n").partition("\t")
+            if sep:
+                table[old] = new
+    return table
+
+
+def live_document_names(*dir_names):
+    """Relative paths of the current documents in the given directories."""
+    live = set()
+    for dir_name in dir_names:
+        directory = os.path.join(BASE_DIR, dir_name)
+        if os.path.isdir(directory):
+            prefix = os.path.relpath(directory, BASE_DIR).replace(os.sep, "/")
+            live.update(f"{prefix}/{name}" for name in os.listdir(directory))
+    return live
+
+
+# --- 主程序入口 ---
+if __name__ == "__main__":
+    table_path = os.path.join(BASE_DIR, TABLE_FILE_NAME)
+    if len(sys.argv) > 1:
+        if not os.path.exists(table_path):
+            print(f"[Error] Redirect table not found: {table_path}")
+            sys.exit(1)
+        table = load_redirect_table(table_path)
+        print(table.get(sys.argv[1], sys.argv[1]))
+    else:
+        from rename import NO_NUMBER_DIR_NAME, TARGET_DIR_NAME
+
+        history = RedirectHistory(os.path.join(BASE_DIR, HISTORY_FILE_NAME))
+        live = live_document_names(TARGET_DIR_NAME, NO_NUMBER_DIR_NAME)
+        count = history.write_table(table_path, live)
+        print(f"Wrote {count} redirects to: {table_path}")
@@ -1,65 +1,165 @@
 import os
 import re
+import shutil
 import yaml
 
+from bundle import rebuild_bundle
+from streaming import copy_range, file_size
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DOCS_DIR = os.path.join(BASE_DIR, "docs")
 
-def extract_front_matter(content):
-    match = re.match(r"^\s*---\s*$(.*?)^---\s*$(.*)", content, re.DOTALL | re.MULTILINE)
-    if match:
-        yaml_str = match.group(1).strip()
-        markdown_content = match.group(2).strip()
-        try:
-            front_matter = yaml.safe_load(yaml_str)
-            if front_matter is None:
-                return {}, markdown_content
-            return (
-                front_matter if isinstance(front_matter, dict) else {}
-            ), markdown_content
-        except yaml.YAMLError as e:
-            print(f"  [Error] YAML Parsing Failed: {e}")
-            return None, content
+# 修改以字节区间补丁 (start, end, replacement) 的形式计算，只改动标题行和 title 行，
+# 其余 YAML 格式、引号、键顺序和换行符保持原样。
+FRONT_MATTER_OPEN_RE = re.compile(rb"\A\s*---[ \t]*\r?\n")
+FRONT_MATTER_CLOSE_RE = re.compile(rb"^---[ \t]*(?:\r?\n|\Z)", re.MULTILINE)
+HEADING_RE = re.compile(rb"^\s*?(#[ \t]+(.+?)[ \t]*)(\r?\n|\Z)", re.MULTILINE)
+BLANK_LINE_RE = re.compile(rb"[ \t]*\r?\n")
+
+def _title_line(heading, newline):
+    # 与 rename.front_matter_header 的 dump 参数一致（含默认行宽折行），
+    # 这样再次整体 dump 时 title 行不变，增量运行可以收敛
+    line = yaml.dump({"title": heading}, allow_unicode=True, default_flow_style=False, sort_keys=False)
+    return line.rstrip("\n").encode("utf-8") + newline
+
+def find_title_patches(data, filepath=None):
+    """
+    计算移除正文大标题 / 补充 frontmatter title 所需的补丁。
+    Returns a list of (start, end, replacement) byte ranges; empty if nothing changes
+    or if the front matter cannot safely take a title line (reported, not patched).
+    Raises yaml.YAMLError if the front matter cannot be parsed.
+    """
+    open_match = FRONT_MATTER_OPEN_RE.match(data)
+    close_match = open_match and FRONT_MATTER_CLOSE_RE.search(data, open_match.end())
+    if close_match:
+        yaml_text = data[open_match.end():close_match.start()].decode("utf-8")
+        front_matter = yaml.safe_load(yaml_text)
+        if front_matter is None:
+            front_matter = {}  # 空 frontmatter
+        elif not isinstance(front_matter, dict):
+            print(f"[Skipping] Frontmatter is not a mapping in {filepath or 'document'}")
+            return []
+        body_start = close_match.end()
     else:
-        return {}, content
+        front_matter = None  # 没有 frontmatter
+        body_start = 0
 
-def process_markdown_file(filepath):
-    with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read()
+    # 提取正文中的第一个大标题（必须是正文第一行非空内容）
+    match = HEADING_RE.match(data, body_start)
+    if not match:
+        return []
+    heading = match.group(2).decode("utf-8").strip()
+    newline = b"\r\n" if b"\r\n" in data[:match.end()] else b"\n"
+
+    # 删除标题行，以及紧随其后的一个空行
+    drop_start = data.rfind(b"\n", body_start, match.start(1)) + 1 or body_start
+    drop_end = match.end()
+    blank = BLANK_LINE_RE.match(data, drop_end)
+    if blank:
+        drop_end = blank.end()
+    drop_heading = (drop_start, drop_end, b"")
 
-    front_matter, markdown_content = extract_front_matter(content)
+    # 如果 frontmatter 中有 title 且等于正文大标题，则移除正文大标题
+    if front_matter is not None and "title" in front_matter:
+        if front_matter["title"] == heading:
+            return [drop_heading]
+        return []
+    # 如果 frontmatter 中没有 title，则将正文大标题添加到 frontmatter 中
     if front_matter is None:
-        print(f"[Error] Failed to parse frontmatter in {filepath}")
-        return
+        header = b"---" + newline + _title_line(heading, newline) + b"---" + newline + newline
+        return [(0, 0, header), drop_heading]
+    # title 行追加在结束 --- 之前，只适用于块映射形式；流式映射（{a: b}）等写法
+    # 追加后会变成无效 YAML，而标题行已被删除，所以先验证结果再打补丁
+    title_line = _title_line(heading, newline)
+    try:
+        patched = yaml.safe_load(yaml_text + title_line.decode("utf-8"))
+    except yaml.YAMLError:
+        patched = None
+    if patched != {**front_matter, "title": heading}:
+        print(f"[Skipping] Frontmatter is not a block mapping, title not added in {filepath or 'document'}")
+        return []
+    return [(close_match.start(), close_match.start(), title_line), drop_heading]
 
-    # 提取正文中的第一个大标题
-    match = re.match(r"^\s*#\s+(.+?)\s*$", markdown_content, re.MULTILINE)
-    if match:
-        heading = match.group(1).strip()
-        # 如果 frontmatter 中有 title 且等于正文大标题，则移除正文大标题
-        if "title" in front_matter and front_matter["title"] == heading:
-            markdown_content = re.sub(r"^\s*#\s+.+?\s*$\n?", "", markdown_content, 1, re.MULTILINE)
-        # 如果 frontmatter 中没有 title，则将正文大标题添加到 frontmatter 中
-        elif "title" not in front_matter:
-            front_matter["title"] = heading
-            markdown_content = re.sub(r"^\s*#\s+.+?\s*$\n?", "", markdown_content, 1, re.MULTILINE)
+def apply_patches(data, patches):
+    """Applies non-overlapping (start, end, replacement) patches to data."""
+    parts = []
+    position = 0
+    for start, end, replacement in sorted(patches):
+        parts.append(data[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(data[position:])
+    return b"".join(parts)
 
-    # 重新生成文件内容
-    try:
-        new_yaml_str = yaml.dump(front_matter, allow_unicode=True, default_flow_style=False, sort_keys=False)
-        new_content = f"---\n{new_yaml_str}---\n\n{markdown_content}"
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(new_content)
-        print(f"[Processed] {filepath}")
-    except Exception as e:
-        print(f"[Error] Failed to write updated content for {filepath}: {e}")
+def read_prefix(f):
+    """
+    只读取文件开头补丁可能涉及的部分：frontmatter、正文第一行非空内容及其下一行。
+    正文其余部分留在磁盘上，写回时按偏移量复制。
+    """
+    lines = []
+    state = "start"  # start -> front_matter -> body -> heading
+    for line in iter(f.readline, b""):
+        lines.append(line)
+        if state == "heading":
+            break  # 标题行之后再多读一行（可能的空行）
+        if state == "front_matter":
+            if FRONT_MATTER_CLOSE_RE.match(line):
+                state = "body"
+        elif line.strip():
+            if state == "start" and line.strip() == b"---":
+                state = "front_matter"
+            else:
+                state = "heading"
+    return b"".join(lines)
+
+def process_markdown_file(filepath):
+    """Returns True if the file was modified."""
+    with open(filepath, "rb") as f:
+        prefix = read_prefix(f)
+        try:
+            patches = find_title_patches(prefix, filepath)
+        except (yaml.YAMLError, UnicodeDecodeError) as e:
+            print(f"[Error] Failed to parse frontmatter in {filepath}: {e}")
+            return False
+
+        new_prefix = apply_patches(prefix, patches)
+        if new_prefix == prefix:
+            return False  # 内容未变化，不写文件（保留 mtime）
+
+        # 新开头 + 原文件剩余部分（按偏移量复制），写入临时文件后替换
+        tmp_path = f"{filepath}.tmp"
+        try:
+            with open(tmp_path, "wb") as out:
+                out.write(new_prefix)
+                copy_range(f, out, len(prefix), file_size(f))
+            shutil.copymode(filepath, tmp_path)
+            os.replace(tmp_path, filepath)
+            print(f"[Processed] {filepath}")
+            return True
+        except OSError as e:
+            print(f"[Error] Failed to write updated content for {filepath}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
 
-def process_docs_directory(docs_dir):
+def process_docs_directory(docs_dir, rebuild=True):
+    """
+    Processes every .md file; when any file changed (and rebuild is set),
+    docs.bundle is rebuilt so it matches the directory again.
+    """
+    total_count = 0
+    modified_count = 0
     for root, _, files in os.walk(docs_dir):
         for filename in files:
             if filename.lower().endswith(".md"):
                 filepath = os.path.join(root, filename)
-                process_markdown_file(filepath)
+                total_count += 1
+                if process_markdown_file(filepath):
+                    modified_count += 1
+    print(f"Modified {modified_count} of {total_count} files")
+    if rebuild and modified_count:
+        rebuild_bundle(docs_dir)
+    return modified_count
 
 if __name__ == "__main__":
     if os.path.exists(DOCS_DIR):
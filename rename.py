@@ -1,117 +1,125 @@
 import os
 import yaml
-import re
 import datetime
+import shutil
+
+from assets import IMAGE_HINT_RE, REFERENCE_OVERLAP, AssetStage
+from bundle import rebuild_bundle
+from document import Document, parse_front_matter
+from redirects import (
+    HISTORY_FILE_NAME,
+    TABLE_FILE_NAME,
+    RedirectHistory,
+    live_document_names,
+    no_number_name,
+)
+from streaming import (
+    contains,
+    copy_range,
+    file_size,
+    iter_chunks,
+    read_front_matter,
+    stripped_range,
+)
 
 # --- Path Setup ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # --- Configuration ---
-timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-docs_path = os.path.join(BASE_DIR, "docs")
-if os.path.exists(docs_path):
-    docs_timestamp = f"docs_{timestamp}"
-    os.rename(docs_path, os.path.join(BASE_DIR, docs_timestamp))
-    SOURCE_DIR_NAME = docs_timestamp
-    TARGET_DIR_NAME = "docs"
-else:
-    print(f"Warning: 'docs' directory not found in {BASE_DIR}")
-    print("Creating a new 'docs' directory...")
-    SOURCE_DIR_NAME = "docs_empty_source"
-    TARGET_DIR_NAME = "docs"
-    os.makedirs(
-        os.path.join(BASE_DIR, SOURCE_DIR_NAME), exist_ok=True
-    )
-
+TARGET_DIR_NAME = "docs"
+EMPTY_SOURCE_DIR_NAME = "docs_empty_source"
 ARCHIVE_PREFIX = "docs_new_archive_"  # Prefix for archived directories
 NO_NUMBER_DIR_NAME = "docs_original_no_direct_edit"  # 新增：无编号文件夹名称
+ASSET_DIR_NAME = os.path.join("asset", "image")
+RENAME_ASSETS = True  # Rename images to content-addressed names, rewrite refs
 
-# --- Mapping Configuration ---
-# (Mappings remain the same as the previous version)
-PRIMARY_TYPE_MAP = {
-    "conceptual": 1,
-    "implementation": 2,
-    "operational": 3,
-    "reference": 4,
-}
-DEFAULT_W = 0
-DETAIL_TYPE_MAPS = {
-    "conceptual": {"introduction": 1, "principles": 2, "architecture": 3},
-    "implementation": {"basic": 1, "standard": 2, "high": 3, "advanced": 4},
-    "operational": {"setup": 1, "deployment": 2, "maintenance": 3},
-    "reference": {"core": 1, "configuration": 2, "examples": 3},
-}
-DEFAULT_X = 0
-LEVEL_MAP = {
-    "beginner": 1,
-    "intermediate": 2,
-    "advanced": 3,
-}
-DEFAULT_Y = 0
-PRIORITY_NORMAL = 0
-PRIORITY_HIGH = 9
-PRIORITY_ADVANCED_LEVEL_KEY = "advanced"
-PRIORITY_IMPLEMENTATION_PRIMARY_KEY = "implementation"
-PRIORITY_IMPLEMENTATION_DETAIL_KEYS = {"high", "advanced"}
+# Taxonomy -> PWXY mappings: see document.py
 
 # --- Configuration End ---
 
 # --- Helper Functions ---
-# (extract_front_matter remains the same)
 
 
-def extract_front_matter(content):
-    match = re.match(r"^\s*---\s*$(.*?)^---\s*$(.*)", content, re.DOTALL | re.MULTILINE)
-    if match:
-        yaml_str = match.group(1).strip()
-        markdown_content = match.group(2).strip()
-        try:
-            front_matter = yaml.safe_load(yaml_str)
-            if front_matter is None:
-                return {}, markdown_content
-            return (
-                front_matter if isinstance(front_matter, dict) else {}
-            ), markdown_content
-        except yaml.YAMLError as e:
-            print(f"  [Error] YAML Parsing Failed: {e}")
-            return None, content
-    else:
-        return {}, content
-
-
-# (sanitize_filename_part remains mostly the same, ensures non-empty return)
-
-
-def sanitize_filename_part(part):
-    if not isinstance(part, str):
-        part = str(part)
-    part = part.lower()
-    # Replace common problematic characters first
-    part = part.replace("&", "and").replace("@", "at")
-    part = re.sub(r"\s+", "-", part)  # Whitespace to hyphen
-    # Keep letters, numbers, underscore, hyphen. Remove others.
-    part = re.sub(r"[^\w\-]+", "", part)
-    part = part.strip(".-_")  # Remove leading/trailing separators
-    # Ensure it's not empty, provide a default if it becomes empty
-    return part or "untitled"
+def read_document(source):
+    """
+    Streaming counterpart of document.extract_front_matter for an open binary file.
+    Returns (front_matter, body_start, body_end): the body is left on disk and
+    addressed by byte offsets (stripped, like extract_front_matter does).
+    front_matter is None on YAML errors.
+    """
+    size = file_size(source)
+    yaml_bytes, body_offset = read_front_matter(source)
+    if yaml_bytes is None:
+        return {}, 0, size
+    front_matter = parse_front_matter(yaml_bytes.decode("utf-8").strip())
+    body_start, body_end = stripped_range(source, body_offset, size)
+    return front_matter, body_start, body_end
+
+
+def write_document(source, body_start, body_end, header, target_filepath, asset_stage, doc_name):
+    """
+    Writes header + body to target_filepath without holding the body in
+    memory. Bodies without image references are copied by offset (in-kernel
+    where possible); others are streamed through the asset stage in
+    line-aligned chunks that never split a reference. Asset names the rewrite
+    left in the output are reported to the asset stage. The document is
+    written to a temporary file and moved into place, so a failure never
+    leaves a partial file that later files would collide with.
+    """
+    header_bytes = header.encode("utf-8")
+    tmp_path = f"{target_filepath}.tmp"
+    try:
+        with open(tmp_path, "wb") as target:
+            target.write(header_bytes)
+            if asset_stage is None:
+                copy_range(source, target, body_start, body_end)
+            elif contains(source, body_start, body_end, IMAGE_HINT_RE):
+                asset_stage.find_unrewritten(header_bytes, doc_name)
+                for chunk in iter_chunks(
+                    source, body_start, body_end, IMAGE_HINT_RE, REFERENCE_OVERLAP
+                ):
+                    data = asset_stage.rewrite(chunk.decode("utf-8"), doc_name).encode("utf-8")
+                    asset_stage.find_unrewritten(data, doc_name)
+                    target.write(data)
+            else:
+                asset_stage.find_unrewritten(header_bytes, doc_name)
+                asset_stage.scan_unrewritten(source, body_start, body_end, doc_name)
+                copy_range(source, target, body_start, body_end)
+        # Only complete documents appear under the target name
+        os.replace(tmp_path, target_filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def prepare_source_dir():
+    """
+    Moves the current 'docs' directory aside (docs_<timestamp>) so it can be
+    used as the processing source, and returns the source directory name.
+    Kept out of module import so other scripts can import from rename.py.
+    """
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    docs_path = os.path.join(BASE_DIR, TARGET_DIR_NAME)
+    if os.path.exists(docs_path):
+        docs_timestamp = f"docs_{timestamp}"
+        os.rename(docs_path, os.path.join(BASE_DIR, docs_timestamp))
+        return docs_timestamp
+
+    print(f"Warning: 'docs' directory not found in {BASE_DIR}")
+    print("Creating a new 'docs' directory...")
+    os.makedirs(os.path.join(BASE_DIR, EMPTY_SOURCE_DIR_NAME), exist_ok=True)
+    return EMPTY_SOURCE_DIR_NAME
 
 
 # --- Main Processing Function ---
 
 
-def process_markdown_files(source_dir, target_dir):
+def prepare_target_dirs(target_dir, no_number_dir):
     """
-    Processes markdown files, archives old target dir, uses PWXY-[title].lang.md format.
-    Also creates a copy without numbering in docs_original_no_direct_edit folder.
+    Archives the existing target directory and creates fresh target and
+    no-number directories. Returns False if processing must be aborted.
     """
-    print("Starting processing...")
-    print(f"Source Directory: {source_dir}")
-    print(f"Target Directory: {target_dir}")
-    
-    # 新增：无编号文件夹路径
-    no_number_dir = os.path.join(BASE_DIR, NO_NUMBER_DIR_NAME)
-    print(f"No Number Directory: {no_number_dir}")
-
     # --- Archive Existing Target Directory ---
     if os.path.exists(target_dir):
         if os.path.isdir(target_dir):
@@ -123,13 +131,13 @@ def process_markdown_files(source_dir, target_dir):
             except OSError as e:
                 print(f"[Error] Failed to archive existing target directory: {e}")
                 print("Aborting to prevent data loss.")
-                return  # Stop execution if archiving fails
+                return False  # Stop execution if archiving fails
         else:
             print(
                 f"[Error] Target path '{target_dir}' exists but is not a directory. Please remove or rename it manually."
             )
             print("Aborting.")
-            return
+            return False
 
     # --- Create New Target Directory ---
     try:
@@ -139,14 +147,13 @@ def process_markdown_files(source_dir, target_dir):
     except OSError as e:
         print(f"[Error] Failed to create target directory '{target_dir}': {e}")
         print("Aborting.")
-        return
+        return False
     
     # --- 创建无编号文件目录 ---
     try:
         # 如果已存在则先删除
         if os.path.exists(no_number_dir):
             if os.path.isdir(no_number_dir):
-                import shutil
                 shutil.rmtree(no_number_dir)
             else:
                 os.remove(no_number_dir)
@@ -157,12 +164,109 @@ def process_markdown_files(source_dir, target_dir):
     except OSError as e:
         print(f"[Error] Failed to create no-number directory '{no_number_dir}': {e}")
         print("Will skip saving no-number versions.")
+    return True
+
+
+def new_counts():
+    return {"processed": 0, "skipped": 0, "errors": 0, "warnings": 0, "no_number": 0}
+
+
+def front_matter_header(front_matter):
+    """The '---' delimited YAML header written in front of every output body."""
+    new_yaml_str = yaml.dump(
+        front_matter,
+        allow_unicode=True,
+        default_flow_style=False,
+        sort_keys=False,
+    )
+    return f"---\n{new_yaml_str}---\n\n"
+
+
+def save_no_number_copy(target_filepath, filename, sanitized_title, lang_suffix, no_number_dir, redirects):
+    """
+    Copies an output document to the no-number directory (title.lang.md,
+    '-dup' on a name clash) and records its redirect. Returns True if saved.
+    """
+    # --- 写入无编号版本 ---
+    try:
+        if os.path.exists(no_number_dir):
+            # 去掉编号前缀，只保留标题部分
+            no_number_filename = f"{sanitized_title}{lang_suffix}.md"
+            no_number_filepath = os.path.join(no_number_dir, no_number_filename)
+            
+            # 检查文件是否已存在 - 简化重名处理
+            if os.path.exists(no_number_filepath):
+                # 简单处理，只添加-dup标记
+                no_number_filename = f"{sanitized_title}-dup{lang_suffix}.md"
+                no_number_filepath = os.path.join(no_number_dir, no_number_filename)
+                    
+            shutil.copyfile(target_filepath, no_number_filepath)
+            old_no_number_filename = no_number_name(filename)
+            if old_no_number_filename:
+                redirects.record(
+                    f"{NO_NUMBER_DIR_NAME}/{old_no_number_filename}",
+                    f"{NO_NUMBER_DIR_NAME}/{no_number_filename}",
+                )
+            return True
+    except Exception as e:
+        print(f"  [Warning] Failed to save no-number version: {e}")
+    return False
+
+
+def finish_outputs(asset_stage, redirects, target_dir, counts):
+    """Asset report, redirect table, bundle and final report after all files."""
+    asset_stage.finish()
+    target_prefix = os.path.relpath(target_dir, BASE_DIR).replace(os.sep, "/")
+
+    # --- Collapse and Write Redirects ---
+    live_names = live_document_names(target_prefix, NO_NUMBER_DIR_NAME)
+    try:
+        redirects.save(live_names)
+        table_path = os.path.join(BASE_DIR, TABLE_FILE_NAME)
+        redirect_count = redirects.write_table(table_path, live_names)
+        print(f"Wrote {redirect_count} redirects to: {table_path}")
+    except OSError as e:
+        print(f"[Error] Failed to write redirects: {e}")
 
-    processed_count = 0
-    skipped_count = 0
-    error_count = 0
-    warning_count = 0  # Counts files with at least one warning
-    no_number_count = 0  # 新增：记录无编号文件数量
+    # --- Pack Target Directory into a Single Bundle File ---
+    rebuild_bundle(target_dir)
+
+    # --- Final Report ---
+    print("\n--- Processing Complete ---")
+    print(f"Successfully processed: {counts['processed']} files")
+    print(f"Skipped (target exists): {counts['skipped']} files")
+    print(f"Files with warnings (missing/unmapped data): {counts['warnings']}")
+    print(f"Errors encountered: {counts['errors']} files")
+    print(f"No-number versions created: {counts['no_number']} files")
+    print("-" * 27)
+
+
+def process_markdown_files(source_dir, target_dir):
+    """
+    Processes markdown files, archives old target dir, uses PWXY-[title].lang.md format.
+    Also creates a copy without numbering in docs_original_no_direct_edit folder.
+    For the sharded (multi-process / multi-host) variant see shard.py.
+    """
+    print("Starting processing...")
+    print(f"Source Directory: {source_dir}")
+    print(f"Target Directory: {target_dir}")
+    
+    # 新增：无编号文件夹路径
+    no_number_dir = os.path.join(BASE_DIR, NO_NUMBER_DIR_NAME)
+    print(f"No Number Directory: {no_number_dir}")
+
+    if not prepare_target_dirs(target_dir, no_number_dir):
+        return
+
+    # --- Start Hashing Assets in the Background ---
+    asset_stage = AssetStage(os.path.join(BASE_DIR, ASSET_DIR_NAME), RENAME_ASSETS)
+    asset_stage.start()
+
+    counts = new_counts()  # warnings counts files with at least one warning
+
+    # --- Redirect History (old name -> new name) ---
+    redirects = RedirectHistory(os.path.join(BASE_DIR, HISTORY_FILE_NAME))
+    target_prefix = os.path.relpath(target_dir, BASE_DIR).replace(os.sep, "/")
 
     total_files = sum(
         1
@@ -182,184 +286,80 @@ def process_markdown_files(source_dir, target_dir):
                 os.sep, "/"
             )
 
-            current_warnings = 0
-
+            source = None
             try:
-                with open(original_filepath, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                front_matter, markdown_content = extract_front_matter(content)
+                source = open(original_filepath, "rb")
+                front_matter, body_start, body_end = read_document(source)
 
                 if front_matter is None:
                     print(f"\nProcessing: {relative_path}")
                     print("  [Skipping] YAML Error in file.")
-                    error_count += 1
+                    counts["errors"] += 1
                     continue
 
-                # --- Extract Metadata (including new fields) ---
-                dimensions = front_matter.get("dimensions", {})
-                type_info = dimensions.get("type", {})
-                primary = type_info.get("primary")
-                detail = type_info.get("detail")
-                level = dimensions.get("level")
-                standard_title = front_matter.get("standard_title")  # New
-                language = front_matter.get("language")  # New
-
-                # --- Determine P, W, X, Y (Logic remains the same) ---
-                P = PRIORITY_NORMAL
-                # (Priority logic based on level and implementation/detail)
-                if level == PRIORITY_ADVANCED_LEVEL_KEY:
-                    P = PRIORITY_HIGH
-                if (
-                    primary == PRIORITY_IMPLEMENTATION_PRIMARY_KEY
-                    and detail in PRIORITY_IMPLEMENTATION_DETAIL_KEYS
-                ):
-                    P = PRIORITY_HIGH
-
-                W = PRIMARY_TYPE_MAP.get(primary, DEFAULT_W)
-                primary_detail_map = DETAIL_TYPE_MAPS.get(primary, {})
-                X = primary_detail_map.get(detail, DEFAULT_X)
-                Y = LEVEL_MAP.get(level, DEFAULT_Y)
-
-                # --- Warnings for missing dimension data (same as before) ---
-                warnings_messages = []
-                if primary is None:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        "  [Warning] Missing dimensions.type.primary"
-                    )
-                elif W == DEFAULT_W:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        f"  [Warning] Unmapped primary type: '{primary}'. Using W={DEFAULT_W}"
-                    )
-                if detail is None:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        "  [Warning] Missing dimensions.type.detail"
-                    )
-                elif X == DEFAULT_X and primary in DETAIL_TYPE_MAPS:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        f"  [Warning] Unmapped detail type: '{detail}' for primary '{primary}'. Using X={DEFAULT_X}"
-                    )
-                elif primary not in DETAIL_TYPE_MAPS and primary is not None:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        f"  [Warning] No detail map defined for primary type: '{primary}'. Using X={DEFAULT_X}"
-                    )
-                if level is None:
-                    current_warnings += 1
-                    warnings_messages.append("  [Warning] Missing dimensions.level")
-                elif Y == DEFAULT_Y:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        f"  [Warning] Unmapped level: '{level}'. Using Y={DEFAULT_Y}"
-                    )
-
-                # --- Construct New Filename using standard_title and language ---
-                prefix_str = f"{P}{W}{X}{Y}"
                 try:
-                    numeric_prefix = int(prefix_str)
-                    padded_prefix = f"{numeric_prefix:04d}"
-                except ValueError:
+                    document = Document(original_filepath, front_matter)
+                    new_filename = document.output_name
+                except ValueError as e:
                     print(f"\nProcessing: {relative_path}")
-                    print(
-                        f"  [Error] Could not form numeric prefix from P={P}, W={W}, X={X}, Y={Y}. Using '0000'."
-                    )
-                    error_count += 1
+                    print(f"  [Error] {e}")
+                    counts["errors"] += 1
                     continue  # Skip file
-
-                # Determine title part (use standard_title or fallback)
-                title_part_to_use = standard_title
-                if not title_part_to_use:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        "  [Warning] Missing 'standard_title'. Using original filename base as fallback."
-                    )
-                    title_part_to_use = os.path.splitext(filename)[0]  # Fallback
-
-                sanitized_title = sanitize_filename_part(title_part_to_use)
-
-                # Determine language suffix
-                lang_suffix = ""
-                if language:
-                    lang_code = str(language).strip().lower()
-                    if lang_code:
-                        lang_suffix = f".{lang_code}"
-                    else:
-                        current_warnings += 1
-                        warnings_messages.append(
-                            "  [Warning] Empty 'language' field found. Omitting suffix."
-                        )
-                else:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        "  [Warning] Missing 'language' field. Omitting suffix."
-                    )
-
-                # Combine parts
-                new_filename = f"{padded_prefix}-[{sanitized_title}]{lang_suffix}.md"
                 target_filepath = os.path.join(target_dir, new_filename)
 
                 # --- Check for Collisions ---
                 if os.path.exists(target_filepath):
                     print(f"\nProcessing: {relative_path}")
                     print(f"  [Skipping] Target file already exists: {new_filename}")
-                    skipped_count += 1
+                    counts["skipped"] += 1
                     continue
 
                 # --- Prepare New Content ---
                 try:
-                    new_yaml_str = yaml.dump(
-                        front_matter,
-                        allow_unicode=True,
-                        default_flow_style=False,
-                        sort_keys=False,
-                    )
+                    header = front_matter_header(front_matter)
                 except Exception as dump_error:
                     print(f"\nProcessing: {relative_path}")
                     print(f"  [Error] Failed to dump updated YAML: {dump_error}")
-                    error_count += 1
+                    counts["errors"] += 1
                     continue
 
-                new_content = f"---\n{new_yaml_str}---\n\n{markdown_content}"
+                # --- Write New File (body streamed, image references rewritten) ---
+                write_document(
+                    source,
+                    body_start,
+                    body_end,
+                    header,
+                    target_filepath,
+                    asset_stage,
+                    new_filename,
+                )
+                new_path = f"{target_prefix}/{new_filename}"
+                old_name = os.path.relpath(original_filepath, source_dir).replace(os.sep, "/")
+                redirects.record(f"{target_prefix}/{old_name}", new_path)
+                redirects.record(document.previous_name, new_path)
+
+                if save_no_number_copy(
+                    target_filepath,
+                    filename,
+                    document.sanitized_title,
+                    document.lang_suffix,
+                    no_number_dir,
+                    redirects,
+                ):
+                    counts["no_number"] += 1
 
-                # --- Write New File ---
-                with open(target_filepath, "w", encoding="utf-8") as f:
-                    f.write(new_content)
-                
-                # --- 写入无编号版本 ---
-                try:
-                    if os.path.exists(no_number_dir):
-                        # 去掉编号前缀，只保留标题部分
-                        no_number_filename = f"{sanitized_title}{lang_suffix}.md"
-                        no_number_filepath = os.path.join(no_number_dir, no_number_filename)
-                        
-                        # 检查文件是否已存在 - 简化重名处理
-                        if os.path.exists(no_number_filepath):
-                            # 简单处理，只添加-dup标记
-                            no_number_filename = f"{sanitized_title}-dup{lang_suffix}.md"
-                            no_number_filepath = os.path.join(no_number_dir, no_number_filename)
-                                
-                        with open(no_number_filepath, "w", encoding="utf-8") as f:
-                            f.write(new_content)
-                        no_number_count += 1
-                except Exception as e:
-                    print(f"  [Warning] Failed to save no-number version: {e}")
-
-                if current_warnings > 0:
+                if document.warnings:
                     print(f"\nProcessing: {relative_path}")
-                    for warning in warnings_messages:
+                    for warning in document.warning_messages:
                         print(warning)
-                    warning_count += (
+                    counts["warnings"] += (
                         1  # Increment file warning count if this file had warnings
                     )
 
-                processed_count += 1
-                if processed_count % 10 == 0 or processed_count == total_files:
+                counts["processed"] += 1
+                if counts["processed"] % 10 == 0 or counts["processed"] == total_files:
                     print(
-                        f"Progress: {processed_count}/{total_files} files processed",
+                        f"Progress: {counts['processed']}/{total_files} files processed",
                         end="\r",
                     )
 
@@ -368,7 +368,7 @@ def process_markdown_files(source_dir, target_dir):
                 print(
                     f"  [Error] File not found during processing: {original_filepath}"
                 )
-                error_count += 1
+                counts["errors"] += 1
             except Exception as e:
                 print(f"\nProcessing: {relative_path}")
                 print(
@@ -377,26 +377,24 @@ def process_markdown_files(source_dir, target_dir):
                 import traceback
 
                 traceback.print_exc()
-                error_count += 1
+                counts["errors"] += 1
+            finally:
+                if source is not None:
+                    source.close()
 
     print("\n")  # Add a newline after progress counter
-    # --- Final Report ---
-    print("\n--- Processing Complete ---")
-    print(f"Successfully processed: {processed_count} files")
-    print(f"Skipped (target exists): {skipped_count} files")
-    print(f"Files with warnings (missing/unmapped data): {warning_count}")
-    print(f"Errors encountered: {error_count} files")
-    print(f"No-number versions created: {no_number_count} files")
-    print("-" * 27)
+
+    finish_outputs(asset_stage, redirects, target_dir, counts)
 
 
 if __name__ == "__main__":
+    SOURCE_DIR_NAME = prepare_source_dir()
     SOURCE_PATH = os.path.join(BASE_DIR, SOURCE_DIR_NAME)
     TARGET_PATH = os.path.join(BASE_DIR, TARGET_DIR_NAME)
     NO_NUMBER_PATH = os.path.join(BASE_DIR, NO_NUMBER_DIR_NAME)  # 新增：无编号路径
     process_markdown_files(SOURCE_PATH, TARGET_PATH)
 
-    if SOURCE_DIR_NAME == "docs_empty_source" and os.path.exists(SOURCE_PATH):
+    if SOURCE_DIR_NAME == EMPTY_SOURCE_DIR_NAME and os.path.exists(SOURCE_PATH):
         try:
             os.rmdir(SOURCE_PATH)
             print(f"Removed temporary source directory: {SOURCE_PATH}")
@@ -0,0 +1,385 @@
+"""
+Front matter schema validation.
+
+The schema below is declarative: each key maps to a rule dict. compile_schema()
+turns it into nested validator closures once at import time, so validating a
+document is a plain function call per key with no schema interpretation.
+
+validate_files() is the batch stage used in CI. Results are cached per content
+hash in CACHE_FILE_NAME (file stat is checked first, so unchanged files are
+not even read); a change to the schema invalidates the whole cache.
+
+Rule keys:
+    type          expected Python type (or tuple of types)
+    required      key must be present
+    non_empty     strings / lists / dicts must not be empty
+    choices       allowed values
+    choices_by    (sibling key, {sibling value: allowed values})
+    pattern       regex the string must fully match
+    fields        schema for a nested dict
+    items         rule for every element of a list
+    allow_unknown nested dict may contain keys not in "fields"
+
+Usage:
+    python schema.py [dir ...]      # exit status 1 if any error was found
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from document import DETAIL_TYPE_MAPS, LEVEL_MAP, PRIMARY_TYPE_MAP, Document
+
+# --- Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCS_DIR_NAME = "docs"
+CACHE_FILE_NAME = ".front_matter_cache.json"
+# --- Configuration End ---
+
+# --- Error Codes ---
+FM_YAML_ERROR = "FM000"
+FM_MISSING = "FM001"
+FM_TYPE = "FM002"
+FM_EMPTY = "FM003"
+FM_CHOICE = "FM004"
+FM_PATTERN = "FM005"
+FM_UNKNOWN_KEY = "FM006"
+
+ERROR = "error"
+WARNING = "warning"
+SEVERITY = {
+    FM_YAML_ERROR: ERROR,
+    FM_MISSING: ERROR,
+    FM_TYPE: ERROR,
+    FM_EMPTY: ERROR,
+    FM_CHOICE: WARNING,  # rename.py falls back to 0 for unmapped values
+    FM_PATTERN: ERROR,
+    FM_UNKNOWN_KEY: WARNING,
+}
+
+Issue = namedtuple("Issue", ["code", "path", "message"])
+
+# --- Schema ---
+_PARAMETER_RULE = {
+    "type": dict,
+    "allow_unknown": True,
+    "fields": {
+        "name": {"type": str, "required": True, "non_empty": True},
+        "use_template": {"type": str},
+        "type": {"type": str, "choices": ["float", "int", "string", "boolean", "text"]},
+        "required": {"type": bool},
+        "min": {"type": (int, float)},
+        "max": {"type": (int, float)},
+        "precision": {"type": int},
+        "options": {"type": list, "items": {"type": str}},
+    },
+}
+
+FRONT_MATTER_SCHEMA = {
+    "dimensions": {
+        "type": dict,
+        "required": True,
+        "fields": {
+            "type": {
+                "type": dict,
+                "required": True,
+                "fields": {
+                    "primary": {
+                        "type": str,
+                        "required": True,
+                        "choices": list(PRIMARY_TYPE_MAP),
+                    },
+                    "detail": {
+                        "type": str,
+                        "required": True,
+                        "choices_by": ("primary", DETAIL_TYPE_MAPS),
+                    },
+                },
+            },
+            "level": {"type": str, "required": True, "choices": list(LEVEL_MAP)},
+        },
+    },
+    "standard_title": {"type": str, "required": True, "non_empty": True},
+    "language": {"type": str, "required": True, "pattern": r"[a-z]{2,3}(-[A-Za-z0-9]+)*"},
+    "title": {"type": str, "non_empty": True},
+    "summary": {"type": str, "non_empty": True},
+    "description": {"type": str},
+    "todo": {"type": str},
+    "previous_name": {"type": str},
+    # Model schema blocks (provider / model YAML embedded as front matter)
+    "parameter_rules": {"type": list, "items": _PARAMETER_RULE},
+    "pricing": {
+        "type": dict,
+        "allow_unknown": True,
+        "fields": {
+            "input": {"type": (int, float, str), "required": True},
+            "output": {"type": (int, float, str)},
+            "unit": {"type": (int, float, str), "required": True},
+            "currency": {"type": str, "required": True, "pattern": r"[A-Z]{3}"},
+        },
+    },
+    "credentials_for_provider": {
+        "type": dict,
+        "allow_unknown": True,
+        "fields": {},
+    },
+}
+# --- Schema End ---
+
+
+def _type_name(expected):
+    if isinstance(expected, tuple):
+        return " | ".join(t.__name__ for t in expected)
+    return expected.__name__
+
+
+def _compile_rule(rule, path):
+    """Returns check(value, parent, issues) for one key."""
+    checks = []
+    expected = rule.get("type")
+    if expected is not None:
+        # bool is an int subclass; never accept it for numeric fields
+        reject_bool = bool not in (expected if isinstance(expected, tuple) else (expected,))
+
+        def check_type(value, parent, issues):
+            if not isinstance(value, expected) or (reject_bool and isinstance(value, bool)):
+                issues.append(
+                    Issue(FM_TYPE, path, f"Expected {_type_name(expected)}, got {type(value).__name__}")
+                )
+                return False
+            return True
+
+        checks.append(check_type)
+
+    if rule.get("non_empty"):
+
+        def check_non_empty(value, parent, issues):
+            if isinstance(value, str) and not value.strip() or value in ({}, []):
+                issues.append(Issue(FM_EMPTY, path, "Must not be empty"))
+                return False
+            return True
+
+        checks.append(check_non_empty)
+
+    if "choices" in rule:
+        allowed = frozenset(rule["choices"])
+
+        def check_choices(value, parent, issues):
+            if value not in allowed:
+                issues.append(Issue(FM_CHOICE, path, f"Unmapped value: '{value}'"))
+            return True
+
+        checks.append(check_choices)
+
+    if "choices_by" in rule:
+        sibling, choice_map = rule["choices_by"]
+        allowed_by = {key: frozenset(values) for key, values in choice_map.items()}
+
+        def check_choices_by(value, parent, issues):
+            sibling_value = parent.get(sibling)
+            # A mistyped sibling is reported by its own type check
+            if not isinstance(sibling_value, str) or sibling_value not in allowed_by:
+                return True
+            if value not in allowed_by[sibling_value]:
+                issues.append(
+                    Issue(FM_CHOICE, path, f"Unmapped value: '{value}' for {sibling} '{sibling_value}'")
+                )
+            return True
+
+        checks.append(check_choices_by)
+
+    if "pattern" in rule:
+        regex = re.compile(rule["pattern"])
+
+        def check_pattern(value, parent, issues):
+            if not regex.fullmatch(value):
+                issues.append(Issue(FM_PATTERN, path, f"'{value}' does not match {rule['pattern']}"))
+            return True
+
+        checks.append(check_pattern)
+
+    if "fields" in rule:
+        validate_fields = _compile_fields(rule["fields"], path + ".", rule.get("allow_unknown", False))
+
+        def check_fields(value, parent, issues):
+            validate_fields(value, issues)
+            return True
+
+        checks.append(check_fields)
+
+    if "items" in rule:
+        check_item = _compile_rule(rule["items"], f"{path}[*]")
+
+        def check_items(value, parent, issues):
+            for item in value:
+                check_item(item, value, issues)
+            return True
+
+        checks.append(check_items)
+
+    def check(value, parent, issues):
+        for single_check in checks:
+            if not single_check(value, parent, issues):
+                return  # Later checks assume the earlier ones passed
+
+    return check
+
+
+def _compile_fields(fields, prefix, allow_unknown):
+    compiled = [
+        (key, rule.get("required", False), _compile_rule(rule, prefix + key))
+        for key, rule in fields.items()
+    ]
+    known = frozenset(fields)
+
+    def validate(mapping, issues):
+        for key, required, check in compiled:
+            if key in mapping:
+                check(mapping[key], mapping, issues)
+            elif required:
+                issues.append(Issue(FM_MISSING, prefix + key, "Missing required key"))
+        if not allow_unknown:
+            for key in mapping:
+                if key not in known:
+                    issues.append(Issue(FM_UNKNOWN_KEY, prefix + str(key), "Unknown key"))
+
+    return validate
+
+
+def compile_schema(schema):
+    """Compiles a schema dict into validate(front_matter) -> [Issue]."""
+    validate_fields = _compile_fields(schema, "", False)
+
+    def validate(front_matter):
+        issues = []
+        validate_fields(front_matter, issues)
+        return issues
+
+    return validate
+
+
+validate_front_matter = compile_schema(FRONT_MATTER_SCHEMA)
+
+SCHEMA_FINGERPRINT = hashlib.sha256(
+    repr(FRONT_MATTER_SCHEMA).encode("utf-8") + repr(sorted(SEVERITY.items())).encode("utf-8")
+).hexdigest()
+
+
+def validate_content(content):
+    """Validates the front matter of a document's text."""
+    document = Document.from_text(None, content, keep_body=False)
+    if document is None:
+        return [Issue(FM_YAML_ERROR, "", "YAML parsing failed")]
+    return validate_front_matter(document.front_matter)
+
+
+# --- Batch Stage ---
+
+
+def _load_cache(cache_path):
+    if not cache_path:
+        return {"schema": SCHEMA_FINGERPRINT, "files": {}, "results": {}}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("schema") == SCHEMA_FINGERPRINT:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"schema": SCHEMA_FINGERPRINT, "files": {}, "results": {}}
+
+
+def validate_files(paths, cache_path=None):
+    """
+    Validates every file and returns (results, validated_count) where results
+    maps path -> [Issue]. Only files whose content hash is not in the cache
+    are parsed; validated_count is the number of such files.
+    """
+    cache = _load_cache(cache_path)
+    cached_files = cache["files"]  # path -> [mtime_ns, size, sha256]
+    cached_results = cache["results"]  # sha256 -> [[code, path, message], ...]
+    results = {}
+    validated_count = 0
+    seen_hashes = set()
+
+    for path in paths:
+        key = os.path.relpath(path, BASE_DIR).replace(os.sep, "/")
+        try:
+            stat = os.stat(path)
+            entry = cached_files.get(key)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                digest = entry[2]
+                content = None
+            else:
+                with open(path, "rb") as f:
+                    raw = f.read()
+                digest = hashlib.sha256(raw).hexdigest()
+                content = raw.decode("utf-8")
+                cached_files[key] = [stat.st_mtime_ns, stat.st_size, digest]
+        except (OSError, UnicodeDecodeError) as e:
+            results[path] = [Issue(FM_YAML_ERROR, "", f"Could not read file: {e}")]
+            continue
+
+        if digest not in cached_results:
+            if content is None:
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            cached_results[digest] = [list(issue) for issue in validate_content(content)]
+            validated_count += 1
+        seen_hashes.add(digest)
+        results[path] = [Issue(*issue) for issue in cached_results[digest]]
+
+    if cache_path:
+        # Drop results for content no longer present in the tree
+        cache["results"] = {d: cached_results[d] for d in seen_hashes}
+        live = {os.path.relpath(p, BASE_DIR).replace(os.sep, "/") for p in paths}
+        cache["files"] = {k: v for k, v in cached_files.items() if k in live}
+        try:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"[Warning] Could not write validation cache: {e}")
+
+    return results, validated_count
+
+
+# --- 主程序入口 ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate Markdown front matter")
+    parser.add_argument("roots", nargs="*", default=[os.path.join(BASE_DIR, DOCS_DIR_NAME)])
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    paths = []
+    for root_dir in args.roots:
+        for root, _, files in os.walk(root_dir):
+            for filename in sorted(files):
+                if filename.lower().endswith(".md"):
+                    paths.append(os.path.join(root, filename))
+
+    cache_path = None if args.no_cache else os.path.join(BASE_DIR, CACHE_FILE_NAME)
+    results, validated_count = validate_files(paths, cache_path)
+
+    error_files = 0
+    warning_files = 0
+    for path, issues in results.items():
+        if not issues:
+            continue
+        print(f"\n{os.path.relpath(path, BASE_DIR).replace(os.sep, '/')}")
+        for issue in issues:
+            print(f"  [{SEVERITY[issue.code].title()}] {issue.code} {issue.path}: {issue.message}")
+        if any(SEVERITY[issue.code] == ERROR for issue in issues):
+            error_files += 1
+        else:
+            warning_files += 1
+
+    print("\n--- Validation Complete ---")
+    print(f"Files checked: {len(paths)} ({validated_count} validated, rest cached)")
+    print(f"Files with errors: {error_files}")
+    print(f"Files with warnings only: {warning_files}")
+    print("-" * 27)
+    sys.exit(1 if error_files else 0)
@@ -0,0 +1,443 @@
+"""
+Sharded rename.py run across worker processes or hosts.
+
+The Markdown files are partitioned by a hash of their path relative to the
+source directory, so every shard (and every re-run of a shard) gets the same
+files. A run has three steps that share a staging directory:
+
+    partition   coordinator: lists the source files in os.walk order, assigns
+                each one to a shard and hashes the assets once
+                (PARTITION_FILE_NAME)
+    work        one per shard: renders its files into shard-<n>/ and writes a
+                manifest with output names, warnings, errors and the images
+                each document references
+    merge       coordinator: replays the manifests in os.walk order with the
+                single-node rules (first file wins a name, later ones are
+                skipped; '-dup' no-number copies), moves the documents into
+                docs/ and runs the asset, redirect and bundle steps
+
+The merged result (docs/, no-number copies, report, redirects, bundle) is the
+same as a plain rename.py run. Usage:
+
+    python shard.py run [--shards N]            # all shards on this machine
+    python shard.py partition [--shards N]      # multi-host: on the coordinator,
+    python shard.py work <shard>                #   then once per shard (any host),
+    python shard.py merge                       #   then on the coordinator
+
+For multi-host runs the staging directory (--staging) must be shared, or the
+shard-<n>/ directories copied back before merging. The source directory must
+be shared too: partition renames docs/ to docs_<timestamp>/ on the
+coordinator only, so a separate checkout on another host does not have it.
+A shard whose source directory is missing fails, and merge refuses to run
+while any file could not be found.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from assets import AssetStage
+from bundle import json_default
+from document import Document, format_warning
+from redirects import HISTORY_FILE_NAME, RedirectHistory
+from rename import (
+    ASSET_DIR_NAME,
+    EMPTY_SOURCE_DIR_NAME,
+    NO_NUMBER_DIR_NAME,
+    RENAME_ASSETS,
+    TARGET_DIR_NAME,
+    finish_outputs,
+    front_matter_header,
+    new_counts,
+    prepare_source_dir,
+    prepare_target_dirs,
+    read_document,
+    save_no_number_copy,
+    write_document,
+)
+
+# --- Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STAGING_DIR_NAME = ".shards"
+PARTITION_FILE_NAME = "partition.json"
+MANIFEST_FILE_NAME = "manifest.json"
+SHARD_FORMAT_VERSION = 1
+# --- Configuration End ---
+
+
+def shard_of(relative_name, num_shards):
+    """Stable shard number for a path relative to the source directory."""
+    digest = hashlib.blake2b(relative_name.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % num_shards
+
+
+def _shard_dir(staging_dir, shard):
+    return os.path.join(staging_dir, f"shard-{shard}")
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, default=json_default)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# --- Coordinator: partition ---
+
+
+def partition_files(source_dir, staging_dir, num_shards):
+    """
+    Writes the partition file for source_dir into a fresh staging directory
+    and returns the number of Markdown files found.
+    """
+    if os.path.isdir(staging_dir) and os.listdir(staging_dir):
+        if not os.path.exists(os.path.join(staging_dir, PARTITION_FILE_NAME)):
+            raise ValueError(f"Staging directory is not empty: {staging_dir}")
+        shutil.rmtree(staging_dir)  # Left over from an earlier run
+    os.makedirs(staging_dir, exist_ok=True)
+
+    files = []  # [walk index, path relative to source_dir, shard]
+    for root, _, filenames in os.walk(source_dir):
+        for filename in filenames:
+            if filename.lower().endswith(".md"):
+                relative_name = os.path.relpath(
+                    os.path.join(root, filename), source_dir
+                ).replace(os.sep, "/")
+                files.append([len(files), relative_name, shard_of(relative_name, num_shards)])
+
+    asset_stage = AssetStage(os.path.join(BASE_DIR, ASSET_DIR_NAME), RENAME_ASSETS)
+    _write_json(
+        os.path.join(staging_dir, PARTITION_FILE_NAME),
+        {
+            "version": SHARD_FORMAT_VERSION,
+            "source_dir": os.path.relpath(source_dir, BASE_DIR).replace(os.sep, "/"),
+            "shards": num_shards,
+            "asset_hashes": asset_stage.hashes(),
+            "files": files,
+        },
+    )
+    return len(files)
+
+
+# --- Worker: one shard ---
+
+
+def render_file(source_dir, index, relative_name, shard_dir, asset_stage):
+    """
+    Renders one document into shard_dir as <index>.md and returns its manifest
+    entry. Output printed while reading (e.g. YAML errors) is kept in 'log'.
+    Collisions are not checked here; merge_shards decides them in walk order.
+    """
+    original_filepath = os.path.join(source_dir, relative_name)
+    entry = {
+        "index": index,
+        "source": relative_name,
+        "path": os.path.relpath(original_filepath, BASE_DIR).replace(os.sep, "/"),
+        "output_name": None,
+        "staged": None,
+        "error": [],
+        "source_missing": False,
+        "log": "",
+    }
+    log = io.StringIO()
+    source = None
+    with contextlib.redirect_stdout(log):
+        try:
+            source = open(original_filepath, "rb")
+            front_matter, body_start, body_end = read_document(source)
+            if front_matter is None:
+                entry["error"] = ["  [Skipping] YAML Error in file."]
+                return entry
+
+            try:
+                document = Document(original_filepath, front_matter)
+                entry["output_name"] = document.output_name
+            except ValueError as e:
+                entry["error"] = [f"  [Error] {e}"]
+                return entry
+            entry.update(
+                sanitized_title=document.sanitized_title,
+                lang_suffix=document.lang_suffix,
+                warnings=document.warnings,  # Codes, rendered by merge_shards
+                previous_name=document.previous_name,
+            )
+
+            try:
+                header = front_matter_header(front_matter)
+            except Exception as dump_error:
+                entry["error"] = [f"  [Error] Failed to dump updated YAML: {dump_error}"]
+                return entry
+
+            # The walk index stands in for the doc name in the asset references
+            staged_name = f"{index}.md"
+            write_document(
+                source,
+                body_start,
+                body_end,
+                header,
+                os.path.join(shard_dir, staged_name),
+                asset_stage,
+                index,
+            )
+            entry["staged"] = staged_name
+        except FileNotFoundError:
+            entry["error"] = [f"  [Error] File not found during processing: {original_filepath}"]
+            entry["source_missing"] = source is None
+        except Exception as e:
+            entry["error"] = [
+                f"  [Error] Unexpected error processing file '{entry['path']}': {e}",
+                traceback.format_exc().rstrip("\n"),
+            ]
+        finally:
+            if source is not None:
+                source.close()
+            entry["log"] = log.getvalue()
+    return entry
+
+
+def run_shard(staging_dir, shard):
+    """Renders every file of one shard and writes its manifest; returns the file count."""
+    partition = _read_json(os.path.join(staging_dir, PARTITION_FILE_NAME))
+    if not 0 <= shard < partition["shards"]:
+        raise ValueError(f"Shard {shard} out of range (0-{partition['shards'] - 1})")
+    source_dir = os.path.join(BASE_DIR, partition["source_dir"])
+    if not os.path.isdir(source_dir):
+        raise FileNotFoundError(
+            f"Source directory not found: {source_dir} (it must be shared with the coordinator)"
+        )
+    shard_dir = _shard_dir(staging_dir, shard)
+    if os.path.isdir(shard_dir):
+        shutil.rmtree(shard_dir)  # Re-run of a failed or lost shard
+    os.makedirs(shard_dir)
+
+    asset_stage = AssetStage(
+        os.path.join(BASE_DIR, ASSET_DIR_NAME),
+        RENAME_ASSETS,
+        hashes=partition["asset_hashes"],
+    )
+    entries = {
+        index: render_file(source_dir, index, relative_name, shard_dir, asset_stage)
+        for index, relative_name, file_shard in partition["files"]
+        if file_shard == shard
+    }
+    for entry in entries.values():
+        entry["shard"] = shard
+        entry["images"] = []
+        entry["unrewritten"] = []
+    for name, indexes in sorted(asset_stage.references.items()):
+        for index in indexes:
+            entries[index]["images"].append(name)
+    for name, indexes in sorted(asset_stage.unrewritten.items()):
+        for index in indexes:
+            entries[index]["unrewritten"].append(name)
+
+    _write_json(
+        os.path.join(shard_dir, MANIFEST_FILE_NAME),
+        {"version": SHARD_FORMAT_VERSION, "shard": shard, "entries": list(entries.values())},
+    )
+    return len(entries)
+
+
+# --- Coordinator: merge ---
+
+
+def _print_error(entry, counts):
+    print(f"\nProcessing: {entry['path']}")
+    print(entry["error"][0])
+    for detail in entry["error"][1:]:
+        print(detail, file=sys.stderr)
+    counts["errors"] += 1
+
+
+def merge_shards(staging_dir, target_dir):
+    """
+    Combines the shard manifests into the target directory exactly as a
+    single-node process_markdown_files run would. Returns False if the merge
+    could not start (missing shards or source files, target directory problems).
+    """
+    partition = _read_json(os.path.join(staging_dir, PARTITION_FILE_NAME))
+    entries = []
+    for shard in range(partition["shards"]):
+        manifest_path = os.path.join(_shard_dir(staging_dir, shard), MANIFEST_FILE_NAME)
+        if not os.path.exists(manifest_path):
+            print(f"[Error] Shard {shard} has not finished (no {manifest_path}).")
+            return False
+        entries.extend(_read_json(manifest_path)["entries"])
+    entries.sort(key=lambda entry: entry["index"])
+    if [entry["index"] for entry in entries] != list(range(len(partition["files"]))):
+        print("[Error] Shard manifests do not match the partition. Re-run the shards.")
+        return False
+
+    missing = [entry["path"] for entry in entries if entry["source_missing"]]
+    if missing:
+        # Merging would archive docs/ and publish it without these files
+        print(f"[Error] {len(missing)} source files were not found by the shards, e.g. {missing[0]}.")
+        print("Make the source directory available to every shard and re-run them.")
+        return False
+
+    source_dir = os.path.join(BASE_DIR, partition["source_dir"])
+    no_number_dir = os.path.join(BASE_DIR, NO_NUMBER_DIR_NAME)
+    print(f"Merging {partition['shards']} shards...")
+    print(f"Source Directory: {source_dir}")
+    print(f"Target Directory: {target_dir}")
+    print(f"No Number Directory: {no_number_dir}")
+
+    if not prepare_target_dirs(target_dir, no_number_dir):
+        return False
+
+    asset_stage = AssetStage(
+        os.path.join(BASE_DIR, ASSET_DIR_NAME),
+        RENAME_ASSETS,
+        hashes=partition["asset_hashes"],
+    )
+    counts = new_counts()
+    redirects = RedirectHistory(os.path.join(BASE_DIR, HISTORY_FILE_NAME))
+    target_prefix = os.path.relpath(target_dir, BASE_DIR).replace(os.sep, "/")
+    print(f"Found {len(entries)} Markdown files to process")
+
+    for entry in entries:
+        sys.stdout.write(entry["log"])
+        new_filename = entry["output_name"]
+        if new_filename is None:
+            _print_error(entry, counts)
+            continue
+
+        # --- Check for Collisions (first file in walk order wins) ---
+        target_filepath = os.path.join(target_dir, new_filename)
+        if os.path.exists(target_filepath):
+            print(f"\nProcessing: {entry['path']}")
+            print(f"  [Skipping] Target file already exists: {new_filename}")
+            counts["skipped"] += 1
+            continue
+        if entry["error"]:
+            _print_error(entry, counts)
+            continue
+
+        try:
+            shutil.move(
+                os.path.join(_shard_dir(staging_dir, entry["shard"]), entry["staged"]),
+                target_filepath,
+            )
+        except OSError as e:
+            entry["error"] = [f"  [Error] Unexpected error processing file '{entry['path']}': {e}"]
+            _print_error(entry, counts)
+            continue
+        asset_stage.add_references(new_filename, entry["images"])
+        asset_stage.add_unrewritten(new_filename, entry["unrewritten"])
+        new_path = f"{target_prefix}/{new_filename}"
+        redirects.record(f"{target_prefix}/{entry['source']}", new_path)
+        redirects.record(entry["previous_name"], new_path)
+
+        if save_no_number_copy(
+            target_filepath,
+            os.path.basename(entry["source"]),
+            entry["sanitized_title"],
+            entry["lang_suffix"],
+            no_number_dir,
+            redirects,
+        ):
+            counts["no_number"] += 1
+
+        if entry["warnings"]:
+            print(f"\nProcessing: {entry['path']}")
+            for warning in entry["warnings"]:
+                print(format_warning(warning))
+            counts["warnings"] += 1
+
+        counts["processed"] += 1
+
+    print("\n")
+    finish_outputs(asset_stage, redirects, target_dir, counts)
+    return True
+
+
+def run_local(num_shards, staging_dir, max_workers=None):
+    """Partition, all shards in a process pool, and merge on this machine."""
+    source_dir_name = prepare_source_dir()
+    source_path = os.path.join(BASE_DIR, source_dir_name)
+    total_files = partition_files(source_path, staging_dir, num_shards)
+    print(f"Partitioned {total_files} Markdown files into {num_shards} shards")
+
+    failed = False
+    with ProcessPoolExecutor(max_workers=max_workers or min(num_shards, os.cpu_count() or 1)) as executor:
+        futures = {
+            executor.submit(run_shard, staging_dir, shard): shard
+            for shard in range(num_shards)
+        }
+        for future in as_completed(futures):
+            try:
+                print(f"Shard {futures[future]}: {future.result()} files rendered")
+            except Exception as e:
+                print(f"[Error] Shard {futures[future]} failed: {e}")
+                failed = True
+
+    if failed:
+        print(f"Aborting merge. Staging directory kept: {staging_dir}")
+    elif merge_shards(staging_dir, os.path.join(BASE_DIR, TARGET_DIR_NAME)):
+        shutil.rmtree(staging_dir)
+
+    if source_dir_name == EMPTY_SOURCE_DIR_NAME and os.path.exists(source_path):
+        try:
+            os.rmdir(source_path)
+            print(f"Removed temporary source directory: {source_path}")
+        except OSError as e:
+            print(f"Note: Could not remove temporary directory: {e}")
+
+
+# --- 主程序入口 ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded rename.py run")
+    parser.add_argument(
+        "--staging",
+        default=os.path.join(BASE_DIR, STAGING_DIR_NAME),
+        help="directory shared by the coordinator and the shards",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="all shards on this machine")
+    run_parser.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    run_parser.add_argument("--workers", type=int, help="worker processes (default: one per shard, up to the CPU count)")
+
+    partition_parser = subparsers.add_parser("partition", help="coordinator: assign files to shards")
+    partition_parser.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+
+    work_parser = subparsers.add_parser("work", help="render one shard")
+    work_parser.add_argument("shard", type=int)
+
+    subparsers.add_parser("merge", help="coordinator: combine the shards into docs/")
+
+    args = parser.parse_args()
+    staging_dir = os.path.abspath(args.staging)
+    if args.command in ("run", "partition") and args.shards < 1:
+        parser.error("--shards must be at least 1")
+
+    try:
+        if args.command == "run":
+            run_local(args.shards, staging_dir, args.workers)
+        elif args.command == "partition":
+            source_dir_name = prepare_source_dir()
+            total_files = partition_files(os.path.join(BASE_DIR, source_dir_name), staging_dir, args.shards)
+            print(f"Partitioned {total_files} Markdown files into {args.shards} shards: {staging_dir}")
+            for shard in range(args.shards):
+                print(f"  python shard.py --staging {staging_dir} work {shard}")
+        elif args.command == "work":
+            count = run_shard(staging_dir, args.shard)
+            print(f"Shard {args.shard}: {count} files rendered into {_shard_dir(staging_dir, args.shard)}")
+        elif args.command == "merge":
+            if not merge_shards(staging_dir, os.path.join(BASE_DIR, TARGET_DIR_NAME)):
+                sys.exit(1)
+    except (OSError, ValueError) as e:
+        print(f"[Error] {e}")
+        sys.exit(1)
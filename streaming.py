@@ -0,0 +1,174 @@
+"""
+Bounded-memory helpers for rewriting documents.
+
+rename.py and remove_title.py only ever change the front matter header (and
+the first heading); the body is copied from the source file by offset
+instead of being read into memory and concatenated with the new header.
+Copies use os.copy_file_range / os.sendfile where the platform has them and
+fall back to fixed-size chunks.
+
+Whitespace stripping of the body (extract_front_matter strips it) is done on
+byte offsets and only treats ASCII whitespace as whitespace.
+"""
+
+import os
+
+COPY_CHUNK_SIZE = 1024 * 1024
+WHITESPACE = b" \t\r\n\x0b\x0c"
+FRONT_MATTER_DELIMITER = b"---"
+
+
+def file_size(f):
+    return os.fstat(f.fileno()).st_size
+
+
+def read_front_matter(f):
+    """
+    Reads the front matter block at the start of a binary file, line by line.
+    Returns (yaml_bytes, body_offset), or (None, 0) when the file has no
+    complete front matter block (same rule as extract_front_matter: optional
+    leading blank lines, a '---' line, YAML, a '---' line).
+    """
+    f.seek(0)
+    offset = 0
+    line = b""
+    while not line.strip():
+        line = f.readline()
+        if not line:
+            return None, 0
+        offset += len(line)
+    if line.strip() != FRONT_MATTER_DELIMITER:
+        return None, 0
+
+    yaml_start = offset
+    while True:
+        line = f.readline()
+        if not line:
+            return None, 0
+        if line.startswith(FRONT_MATTER_DELIMITER) and not line[3:].strip():
+            return _read_at(f, yaml_start, offset), offset + len(line)
+        offset += len(line)
+
+
+def _read_at(f, start, end):
+    position = f.tell()
+    f.seek(start)
+    data = f.read(end - start)
+    f.seek(position)
+    return data
+
+
+def stripped_range(f, start, end):
+    """Narrows [start, end) so it excludes leading / trailing whitespace."""
+    while start < end:
+        f.seek(start)
+        chunk = f.read(min(COPY_CHUNK_SIZE, end - start))
+        content_at = len(chunk) - len(chunk.lstrip(WHITESPACE))
+        start += content_at
+        if content_at < len(chunk):
+            break
+    while end > start:
+        chunk_start = max(start, end - COPY_CHUNK_SIZE)
+        f.seek(chunk_start)
+        chunk = f.read(end - chunk_start)
+        trailing = len(chunk) - len(chunk.rstrip(WHITESPACE))
+        end -= trailing
+        if trailing < len(chunk):
+            break
+    return start, end
+
+
+def contains(f, start, end, pattern):
+    """True if the compiled bytes regex matches within [start, end)."""
+    overlap = 64  # Longer than any hint pattern we search for
+    position = start
+    while position < end:
+        f.seek(position)
+        chunk = f.read(min(COPY_CHUNK_SIZE, end - position))
+        if pattern.search(chunk):
+            return True
+        if position + len(chunk) >= end:
+            break
+        position += len(chunk) - overlap
+    return False
+
+
+def iter_chunks(f, start, end, carry_pattern=None, overlap=0):
+    """
+    Yields [start, end) in chunks of about COPY_CHUNK_SIZE bytes that end at a
+    line break, so UTF-8 characters are never split. When carry_pattern
+    matches within the last `overlap` bytes of a chunk, the chunk is cut at
+    the start of that line and the rest is carried into the next chunk, so a
+    match spanning lines (e.g. an <img> tag) is never split either.
+    """
+    f.seek(start)
+    remaining = end - start
+    carry = b""
+    while remaining > 0:
+        parts = [f.read(min(COPY_CHUNK_SIZE, remaining))]
+        if not parts[0]:
+            break
+        remaining -= len(parts[0])
+        while remaining > 0 and not parts[-1].endswith(b"\n"):
+            line = f.readline(min(remaining, COPY_CHUNK_SIZE))
+            if not line:
+                break
+            parts.append(line)
+            remaining -= len(line)
+        chunk = carry + b"".join(parts)
+        carry = b""
+        if remaining > 0 and carry_pattern is not None:
+            last = None
+            for last in carry_pattern.finditer(chunk, max(0, len(chunk) - overlap)):
+                pass
+            if last is not None:
+                cut = chunk.rfind(b"\n", 0, last.start()) + 1
+                chunk, carry = chunk[:cut], chunk[cut:]
+                if not chunk:
+                    continue  # The match starts on the first line: read on
+        yield chunk
+    if carry:
+        yield carry
+
+
+def copy_range(source, target, start, end):
+    """
+    Appends bytes [start, end) of the source file to the target file at its
+    current position.
+    """
+    target.flush()
+    in_fd, out_fd = source.fileno(), target.fileno()
+    position = start
+
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            while position < end:
+                copied = copy_file_range(in_fd, out_fd, end - position, position)
+                if copied == 0:
+                    break
+                position += copied
+            return
+        except OSError:
+            pass  # e.g. different file systems / unsupported: try the next one
+
+    sendfile = getattr(os, "sendfile", None)
+    if sendfile is not None:
+        try:
+            while position < end:
+                copied = sendfile(out_fd, in_fd, position, end - position)
+                if copied == 0:
+                    break
+                position += copied
+            return
+        except OSError:
+            pass
+
+    source.seek(position)
+    while position < end:
+        chunk = source.read(min(COPY_CHUNK_SIZE, end - position))
+        if not chunk:
+            break
+        target.write(chunk)
+        position += len(chunk)
+    target.flush()